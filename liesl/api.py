@@ -6,11 +6,16 @@ Liesl API
 from liesl.streams.finder import open_stream, open_streaminfo
 from liesl.streams.finder import print_available_streams
 from liesl.streams.finder import get_streams_matching, get_streaminfos_matching
-from liesl.buffers.ringbuffer import RingBuffer
+from liesl.buffers.ringbuffer import RingBuffer, load_dump
+from liesl.buffers.group import BufferGroup
+from liesl.buffers.aio import AsyncRingBuffer, stream
+from liesl.buffers.shared import AttachedRingBuffer
+from liesl.buffers.daemon import DaemonClient
 from liesl.buffers.blockbuffer import SimpleBlockBuffer
 from liesl.buffers.response import Response
 from liesl.streams import localhostname, localhost, localip
 from liesl.streams.convert import inlet_to_dict, get_channel_map
+from liesl.streams.convert import channel_format_to_dtype
 from liesl.files.run import Run
 from liesl.files.session import Session, Recorder
 from liesl.files.xdf.load import XDFFile
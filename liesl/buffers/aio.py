@@ -0,0 +1,188 @@
+"""
+Asyncio
+-------
+"""
+from liesl.buffers.ringbuffer import RingBuffer
+from liesl.streams.finder import open_streaminfo
+from numpy import ndarray
+from typing import Tuple, Callable, AsyncIterator
+import asyncio
+
+
+class AsyncRingBuffer:
+    """an asyncio interface to a :class:`~liesl.buffers.ringbuffer.RingBuffer`
+
+    Subscribes to the ringbuffer, whose acquisition thread then wakes up the
+    event loop with loop.call_soon_threadsafe after every chunk, so that
+    coroutines waiting for data resume without polling. Has to be created while the event loop
+    is running. Iterating over it yields every new chunk with its timestamps.
+
+    args
+    ----
+    buffer: RingBuffer
+        the ringbuffer, which is usually already running
+
+
+    Example::
+
+        async def main():
+            arb = AsyncRingBuffer(rb)
+            await arb.wait_for_samples(100)
+            chunk, tstamps = await arb.get_window(t0, t0 + 0.5)
+            async for chunk, tstamps in arb:
+                print(chunk.shape)
+
+    """
+
+    def __init__(self, buffer: RingBuffer) -> None:
+        self.buffer = buffer
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        self.buffer.subscribe(self._notify)
+
+    def close(self):
+        "stop receiving notifications from the ringbuffer"
+        self.buffer.unsubscribe(self._notify)
+
+    def _notify(self, chunk: ndarray, tstamps: ndarray):
+        "called in the acquisition thread after every chunk"
+        try:
+            self._loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:  # the event loop was closed
+            self.close()
+
+    def _wake(self):
+        "called in the event loop to resume all waiting coroutines"
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def _wait_for(self, predicate: Callable[[], bool], timeout: float) -> bool:
+        "wait until the predicate is true after a chunk arrived"
+
+        async def waiter():
+            while True:
+                changed = self._changed
+                if predicate():
+                    return True
+                await changed.wait()
+
+        try:
+            return await asyncio.wait_for(waiter(), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+    async def wait_for_samples(
+        self, n: int, timeout: float = None, since: int = None
+    ) -> bool:
+        """wait until new samples arrived in the ringbuffer
+
+        args
+        ----
+        n: int
+            how many new samples to wait for
+        timeout: float
+            the maximal time to wait in seconds. defaults to None, i.e. forever
+        since: int
+            the cursor the samples have to be newer than. defaults to None, i.e. the current cursor
+
+        returns
+        -------
+        arrived: bool
+            whether the samples arrived before the timeout expired
+        """
+        target = (self.buffer.cursor if since is None else since) + n
+        return await self._wait_for(lambda: self.buffer.cursor >= target, timeout)
+
+    async def wait_until(self, timestamp: float, timeout: float = None) -> bool:
+        """wait until a sample with at least this timestamp arrived
+
+        args
+        ----
+        timestamp: float
+            the timestamp in the local clock
+        timeout: float
+            the maximal time to wait in seconds. defaults to None, i.e. forever
+
+        returns
+        -------
+        arrived: bool
+            whether the sample arrived before the timeout expired
+        """
+        return await self._wait_for(
+            lambda: self.buffer._newest_tstamp + self.buffer.offset >= timestamp,
+            timeout,
+        )
+
+    async def get_window(
+        self, t_start: float, t_end: float, timeout: float = None
+    ) -> Tuple[ndarray, ndarray]:
+        """wait until the window is complete and get its data and timestamps
+
+        args
+        ----
+        t_start: float
+            the earliest timestamp to return, in the local clock
+        t_end: float
+            the latest timestamp to return, in the local clock
+        timeout: float
+            the maximal time to wait for t_end in seconds. defaults to None, i.e. forever. After the timeout, the window is returned as far as it arrived
+
+        returns
+        -------
+        chunk: ndarray
+            the data within the window (usually in samples x channels)
+        tstamps: ndarray
+            the timestamps for each sample within the window
+        """
+        await self.wait_until(t_end, timeout)
+        return self.buffer.get_window(t_start, t_end)
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[ndarray, ndarray]]:
+        cursor = self.buffer.cursor
+        while True:
+            await self.wait_for_samples(1, since=cursor)
+            chunk, tstamps, cursor = self.buffer.get_since(cursor)
+            yield chunk, tstamps
+
+
+async def stream(
+    duration_in_ms: float = 1000, **kwargs
+) -> AsyncIterator[Tuple[ndarray, ndarray]]:
+    """subscribe to a stream and iterate asynchronously over its chunks
+
+    Resolves the stream without blocking the event loop, runs a
+    :class:`~liesl.buffers.ringbuffer.RingBuffer` for it and stops it again
+    when the iteration ends.
+
+    args
+    ----
+    duration_in_ms: float
+        the length of the ringbuffer in ms
+    **kwargs:
+        keyword arguments to identify the desired stream
+
+
+    Example::
+
+        import liesl
+
+        async def main():
+            async for chunk, tstamps in liesl.stream(name="Liesl-Mock-EEG"):
+                print(chunk.shape)
+
+    """
+    loop = asyncio.get_running_loop()
+    sinfo = await loop.run_in_executor(None, lambda: open_streaminfo(**kwargs))
+    if sinfo is None:
+        raise ConnectionError("No stream found matching {}".format(kwargs))
+    buffer = RingBuffer(sinfo, duration_in_ms=duration_in_ms)
+    buffer.start()
+    arb = AsyncRingBuffer(buffer)
+    try:
+        while not buffer.is_running:
+            await asyncio.sleep(0.01)
+        async for chunk, tstamps in arb:
+            yield chunk, tstamps
+    finally:
+        arb.close()
+        await loop.run_in_executor(None, buffer.stop)
@@ -12,12 +12,26 @@ class RawBlockBuffer:
     def __init__(self, rowlen: int, columnlen: int) -> None:
         self.buffer = np.empty((rowlen, columnlen))
         self.buffer.fill(None)
-        self.head = iter(range(0, rowlen, 1))
+        self.head = 0
+
+    @property
+    def is_full(self) -> bool:
+        "whether all rows of the block were written"
+        return self.head == self.buffer.shape[0]
 
     def append(self, sample: ndarray):
         "append a column of data but raise a StopIteration when full"
-        head = next(self.head)
-        self.buffer[head, :] = sample
+        if self.is_full:
+            raise StopIteration
+        self.buffer[self.head, :] = sample
+        self.head += 1
+
+    def extend(self, chunk: ndarray) -> int:
+        "append as many samples of a chunk as fit and return how many"
+        n = min(len(chunk), self.buffer.shape[0] - self.head)
+        self.buffer[self.head : self.head + n] = chunk[:n]
+        self.head += n
+        return n
 
 
 class SimpleBlockBuffer:
@@ -33,6 +47,8 @@ class SimpleBlockBuffer:
         how many channels (columnlen) each block should have
     max_queued: Union[None, int]
         Whether to queue as many blocks as possible (None) or drop if more than max_queued
+    hop: Union[None, int]
+        after how many samples the next block starts. If set, e.g. smaller than max_samples for overlapping sliding windows, every block is queued as soon as it is complete, and :meth:`~.get` returns read-only views into a contiguous store instead of copies. defaults to None, i.e. consecutive blocks
 
 
     Example::
@@ -46,12 +62,18 @@ class SimpleBlockBuffer:
         assert block[0] == 50.0 # the second block starts with the 50th sample
         assert block.shape == [50, 1]  # as defined during initalization
 
+        # windows of 1s every 50ms of a stream with 1000Hz
+        windows = SimpleBlockBuffer(1000, 8, hop=50)
+
     """
 
-    def __init__(self, max_samples=50, channel_count=64, max_queued=None):
+    def __init__(self, max_samples=50, channel_count=64, max_queued=None, hop=None):
         self.max_samples = max_samples
         self.channel_count = channel_count
         self.max_queued = max_queued
+        if hop is not None and hop < 1:
+            raise ValueError("hop must be at least one sample")
+        self.hop = hop
         self.reset()
 
     def reset(self):
@@ -61,9 +83,43 @@ class SimpleBlockBuffer:
             rowlen=self.max_samples, columnlen=self.channel_count
         )
         self.last_block = None
+        if self.hop is not None:
+            self._store = np.empty(
+                (4 * self.max_samples + self.hop, self.channel_count)
+            )
+            self._fill = 0  # how many rows of the store were written
+            self._next_end = self.max_samples  # the row after the next block
+
+    def _slide(self, chunk: ndarray):
+        """append a chunk to the store and queue every completed block as view
+
+        Once the store is full, a new one is allocated and only the samples
+        of the next block are copied, so that the views already queued stay
+        valid.
+        """
+        done = 0
+        while done < len(chunk):
+            if self._fill == len(self._store):
+                keep = min(self._next_end - self.max_samples, self._fill)
+                store = np.empty_like(self._store)
+                store[: self._fill - keep] = self._store[keep : self._fill]
+                self._store = store
+                self._fill -= keep
+                self._next_end -= keep
+            n = min(len(chunk) - done, len(self._store) - self._fill)
+            self._store[self._fill : self._fill + n] = chunk[done : done + n]
+            self._fill += n
+            done += n
+            while self._next_end <= self._fill:
+                block = self._store[self._next_end - self.max_samples : self._next_end]
+                block.flags.writeable = False
+                self.queue.append(block)
+                self._next_end += self.hop
 
     def handle_sample(self, sample):
         "try to append new samples to the block"
+        if self.hop is not None:
+            return self._slide(np.broadcast_to(sample, (1, self.channel_count)))
         try:
             self.buffer.append(sample)
         except StopIteration:  # when the RawBlockBuffer is full
@@ -72,14 +128,28 @@ class SimpleBlockBuffer:
             self.buffer.append(sample)
 
     def handle_chunk(self, chunk):
-        """iteratively append all samples of a chunk to the block
+        """append all samples of a chunk to the blocks
+
+        The chunk is copied slice by slice, i.e. with one copy per block it
+        spans instead of one per sample. As with :meth:`~.handle_sample`, a
+        full block is only queued once the next sample arrives.
+
         args
         ----
         chunk:np.ndarray
             a new chunk of data to be processed columnwise
         """
-        for sample in chunk:
-            self.handle_sample(sample)
+        chunk = np.asarray(chunk)
+        if chunk.ndim < 2:  # every value is a sample
+            chunk = chunk.reshape(-1, 1)
+        if self.hop is not None:
+            return self._slide(chunk)
+        done = 0
+        while done < len(chunk):
+            if self.buffer.is_full:
+                self.queue.append(self.buffer.buffer)
+                self.buffer = RawBlockBuffer(self.max_samples, self.channel_count)
+            done += self.buffer.extend(chunk[done:])
 
     def get_last(self):
         "return the last valid block"
@@ -90,6 +160,6 @@ class SimpleBlockBuffer:
         try:
             block = self.queue.popleft()
             self.last_block = block
-            return block.copy()
+            return block if self.hop is not None else block.copy()
         except IndexError:
             return None
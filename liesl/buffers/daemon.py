@@ -0,0 +1,257 @@
+"""
+Daemon
+------
+"""
+from liesl.buffers.ringbuffer import RingBuffer
+from liesl.buffers.shared import AttachedRingBuffer
+from liesl.streams.finder import open_streaminfo
+from typing import List, Dict, Union
+from pathlib import Path
+import socketserver
+import threading
+import tempfile
+import socket
+import errno
+import itertools
+import json
+import time
+import os
+
+#: where the daemon listens by default
+DEFAULT_ADDRESS = Path(tempfile.gettempdir()) / "liesl-daemon.sock"
+
+_buffer_numbers = itertools.count()  # shared names are unique per process
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    "answer requests of one client, one json object per line"
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    response = {"error": "Expected an object, not {}".format(request)}
+                elif request.get("cmd") == "list":
+                    response = {"streams": self.server.streams}
+                else:
+                    response = {"error": "Unknown command {}".format(request)}
+            except ValueError as e:
+                response = {"error": str(e)}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class Daemon(threading.Thread):
+    """subscribe once to streams and serve them to local processes
+
+    Every stream is kept in a :class:`~liesl.buffers.ringbuffer.RingBuffer`
+    in shared memory. Clients ask for the streams over a Unix socket with
+    a :class:`~.DaemonClient`, and then read them directly from shared memory
+    with an :class:`~liesl.buffers.shared.AttachedRingBuffer`. Scripts
+    therefore neither resolve the streams again nor open additional inlets.
+    Only streams with a regular sampling rate and numeric channel format can
+    be served.
+
+    args
+    ----
+    streamargs: List[Dict[str, str]]
+        the keyword arguments identifying each stream, e.g. [{"name": "Liesl-Mock-EEG"}]
+    duration_in_ms: float
+        the length of each ringbuffer in ms
+    address: Union[None, str, Path]
+        the path of the Unix socket. defaults to None, i.e. :data:`DEFAULT_ADDRESS`
+
+
+    Example::
+
+        daemon = Daemon([{"type": "EEG"}], duration_in_ms=10_000)
+        daemon.await_running()
+
+        # in any other process on this computer
+        arb = DaemonClient().attach(type="EEG")
+        chunk, tstamps = arb.get()
+
+    """
+
+    def __init__(
+        self,
+        streamargs: List[Dict[str, str]],
+        duration_in_ms: float = 1000,
+        address: Union[None, str, Path] = None,
+    ) -> None:
+        threading.Thread.__init__(self)
+        self.address = Path(DEFAULT_ADDRESS if address is None else address)
+        self.buffers: List[RingBuffer] = []
+        self.streams: List[dict] = []
+        sinfos = []
+        for kwargs in streamargs:  # before any shared memory is created
+            sinfo = open_streaminfo(**kwargs)
+            if sinfo is None:
+                raise ConnectionError("No stream found matching {}".format(kwargs))
+            sinfos.append(sinfo)
+        for sinfo in sinfos:
+            shared_name = "liesl-{}-{}".format(os.getpid(), next(_buffer_numbers))
+            try:
+                buffer = RingBuffer(
+                    sinfo, duration_in_ms=duration_in_ms, shared_name=shared_name
+                )
+            except Exception:
+                for buffer in self.buffers:
+                    buffer.close()
+                raise
+            self.buffers.append(buffer)
+            self.streams.append(
+                {
+                    "shared_name": shared_name,
+                    "name": sinfo.name(),
+                    "type": sinfo.type(),
+                    "source_id": sinfo.source_id(),
+                    "hostname": sinfo.hostname(),
+                    "channel_count": sinfo.channel_count(),
+                    "nominal_srate": sinfo.nominal_srate(),
+                    "channel_format": sinfo.channel_format(),
+                }
+            )
+        self._server = None
+        self._failure: Union[None, Exception] = None
+        self._is_running = threading.Event()
+
+    def stop(self):
+        "stop serving, unsubscribe from all streams and release the shared memory"
+        self.is_running = False
+        if self._server is not None:
+            self._server.shutdown()
+        if self.is_alive():
+            self.join()
+        for buffer in self.buffers:
+            buffer.close()
+
+    @property
+    def is_running(self):
+        "whether the daemon is serving the streams or not"
+        return self._is_running.is_set()
+
+    @is_running.setter
+    def is_running(self, state: bool):
+        if state:
+            self._is_running.set()
+        else:
+            self._is_running.clear()
+
+    def await_running(self):
+        """block until the daemon has subscribed to all streams and serves them
+
+        Raises the exception which stopped the daemon from serving, e.g. an
+        OSError if another daemon is already listening at the address. Call
+        :meth:`~.stop` afterwards to release the shared memory.
+        """
+        try:
+            self.start()
+        except RuntimeError:  # pragma no cover
+            pass
+        while not self.is_running:
+            if not self.is_alive():
+                if self._failure is not None:
+                    raise self._failure
+                raise RuntimeError("The daemon has stopped")
+            time.sleep(0.1)
+
+    def _claim_address(self):
+        "remove the socket of a daemon which crashed, but not of a live one"
+        if not self.address.exists():
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(str(self.address))
+            except OSError:  # left over from a daemon which crashed
+                self.address.unlink()
+                return
+        raise OSError(
+            errno.EADDRINUSE, "A daemon is already listening", str(self.address)
+        )
+
+    def run(self):
+        """"""
+        try:
+            for buffer in self.buffers:
+                buffer.await_running()
+            self._claim_address()
+            self._server = socketserver.ThreadingUnixStreamServer(
+                str(self.address), _Handler
+            )
+        except Exception as e:
+            self._failure = e
+            for buffer in self.buffers:
+                if buffer.is_alive():
+                    buffer.stop()
+            return
+        self._server.daemon_threads = True
+        self._server.streams = self.streams
+        self.is_running = True
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self.address.unlink()
+
+
+class DaemonClient:
+    """ask a local :class:`~.Daemon` for its streams
+
+    args
+    ----
+    address: Union[None, str, Path]
+        the path of the Unix socket of the daemon. defaults to None, i.e. :data:`DEFAULT_ADDRESS`
+
+
+    Example::
+
+        client = DaemonClient()
+        print(client.list())
+        arb = client.attach(name="Liesl-Mock-EEG")
+        chunk, tstamps = arb.get_window(t0, t1)
+
+    """
+
+    def __init__(self, address: Union[None, str, Path] = None) -> None:
+        self.address = Path(DEFAULT_ADDRESS if address is None else address)
+
+    def request(self, cmd: str) -> dict:
+        "send a command to the daemon and return its response"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(self.address))
+            with sock.makefile("rwb") as f:
+                f.write(json.dumps({"cmd": cmd}).encode() + b"\n")
+                f.flush()
+                response = json.loads(f.readline())
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response
+
+    def list(self) -> List[dict]:
+        """the streams served by the daemon
+
+        returns
+        -------
+        streams: List[dict]
+            the shared_name, name, type, source_id, hostname, channel_count, nominal_srate and channel_format of each stream
+        """
+        return self.request("list")["streams"]
+
+    def attach(self, **kwargs) -> AttachedRingBuffer:
+        """attach to the first stream served by the daemon matching all kwargs
+
+        args
+        ----
+        **kwargs:
+            fields of the stream and their values, e.g. name="Liesl-Mock-EEG"
+
+        returns
+        -------
+        buffer: AttachedRingBuffer
+            reads the ringbuffer of the stream from shared memory
+        """
+        for stream in self.list():
+            if all(stream.get(k) == v for k, v in kwargs.items()):
+                return AttachedRingBuffer(stream["shared_name"])
+        raise ConnectionError("No stream served matching {}".format(kwargs))
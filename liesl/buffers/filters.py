@@ -0,0 +1,191 @@
+"""
+Filters
+-------
+"""
+import numpy as np
+from numpy import ndarray
+from math import pi, sin, cos, exp
+from typing import List, Union
+
+try:
+    from scipy.signal import sosfilt as _sosfilt
+except ImportError:  # pragma no cover
+    _sosfilt = None
+
+
+class SOSFilter:
+    """a causal IIR filter of cascaded second-order sections
+
+    The filter keeps its state between calls of :meth:`~.process`, so that a
+    stream can be filtered chunk by chunk without edge artifacts. All channels
+    are filtered at once.
+
+    If scipy is installed, the sections are applied by
+    scipy.signal.sosfilt. Otherwise, a pure NumPy fallback loops over every
+    sample of every section in Python. It costs about 5 to 10 µs per sample
+    and section, mostly independent of the number of channels, e.g. 7 to 17 %
+    of a core for 5 kHz through three sections, spent in the acquisition
+    thread of a ringbuffer. Install scipy for high sampling rates.
+
+    args
+    ----
+    sos: ndarray
+        the second-order sections as (sections x [b0, b1, b2, a0, a1, a2]), e.g. as designed by scipy.signal.butter(..., output="sos")
+
+
+    Example::
+
+        hp = highpass(1, fs=1000)
+        filtered = hp.process(chunk)
+    """
+
+    def __init__(self, sos: ndarray) -> None:
+        sos = np.atleast_2d(np.asarray(sos, dtype=np.float64))
+        if sos.shape[1] != 6:
+            raise ValueError("Second-order sections must have 6 coefficients")
+        self.sos = sos / sos[:, 3:4]
+        self.reset()
+
+    def reset(self):
+        "forget the filter state"
+        self._zi = None
+
+    def process(self, chunk: ndarray) -> ndarray:
+        """filter a chunk and update the filter state
+
+        args
+        ----
+        chunk: ndarray
+            the samples to filter (samples x channels)
+
+        returns
+        -------
+        filtered: ndarray
+            the filtered samples as float64 (samples x channels)
+        """
+        x = np.array(chunk, dtype=np.float64, ndmin=2)
+        if self._zi is None or self._zi.shape[2] != x.shape[1]:
+            self._zi = np.zeros((len(self.sos), 2, x.shape[1]))
+        if _sosfilt is not None:  # same state layout as below
+            x, self._zi = _sosfilt(self.sos, x, axis=0, zi=self._zi)
+            return x
+        for (b0, b1, b2, a0, a1, a2), zi in zip(self.sos, self._zi):
+            z1, z2 = zi
+            for n, xn in enumerate(x):  # transposed direct form II
+                yn = b0 * xn + z1
+                z1 = b1 * xn - a1 * yn + z2
+                z2 = b2 * xn - a2 * yn
+                x[n] = yn
+            zi[0], zi[1] = z1, z2
+        return x
+
+
+class FilterChain:
+    """apply several filters one after another
+
+    args
+    ----
+    filters: List[SOSFilter]
+        the filters in the order they are applied
+    """
+
+    def __init__(self, filters: List[SOSFilter]) -> None:
+        self.filters = list(filters)
+
+    def reset(self):
+        "forget the state of all filters"
+        for f in self.filters:
+            f.reset()
+
+    def process(self, chunk: ndarray) -> ndarray:
+        """filter a chunk with all filters and update their state
+
+        args
+        ----
+        chunk: ndarray
+            the samples to filter (samples x channels)
+
+        returns
+        -------
+        filtered: ndarray
+            the filtered samples as float64 (samples x channels)
+        """
+        chunk = np.array(chunk, dtype=np.float64, ndmin=2)
+        for f in self.filters:
+            chunk = f.process(chunk)
+        return chunk
+
+
+def _biquad(b: List[float], a: List[float]) -> SOSFilter:
+    return SOSFilter([b + a])
+
+
+def notch(freq: float, fs: float, quality: float = 30) -> SOSFilter:
+    """a notch filter, e.g. against line noise
+
+    args
+    ----
+    freq: float
+        the frequency to remove in Hz
+    fs: float
+        the sampling rate in Hz
+    quality: float
+        the quality factor, i.e. freq divided by the bandwidth
+    """
+    w = 2 * pi * freq / fs
+    alpha = sin(w) / (2 * quality)
+    return _biquad([1, -2 * cos(w), 1], [1 + alpha, -2 * cos(w), 1 - alpha])
+
+
+def highpass(freq: float, fs: float, quality: float = 0.5 ** 0.5) -> SOSFilter:
+    """a second-order highpass filter
+
+    args
+    ----
+    freq: float
+        the cutoff frequency in Hz
+    fs: float
+        the sampling rate in Hz
+    quality: float
+        the quality factor, defaults to a Butterworth response
+    """
+    w = 2 * pi * freq / fs
+    alpha = sin(w) / (2 * quality)
+    b = (1 + cos(w)) / 2
+    return _biquad([b, -2 * b, b], [1 + alpha, -2 * cos(w), 1 - alpha])
+
+
+def lowpass(freq: float, fs: float, quality: float = 0.5 ** 0.5) -> SOSFilter:
+    """a second-order lowpass filter
+
+    args
+    ----
+    freq: float
+        the cutoff frequency in Hz
+    fs: float
+        the sampling rate in Hz
+    quality: float
+        the quality factor, defaults to a Butterworth response
+    """
+    w = 2 * pi * freq / fs
+    alpha = sin(w) / (2 * quality)
+    b = (1 - cos(w)) / 2
+    return _biquad([b, 2 * b, b], [1 + alpha, -2 * cos(w), 1 - alpha])
+
+
+def dc_removal(fs: float, freq: float = 0.1) -> SOSFilter:
+    """a first-order filter removing the DC offset
+
+    args
+    ----
+    fs: float
+        the sampling rate in Hz
+    freq: float
+        the cutoff frequency in Hz
+    """
+    r = exp(-2 * pi * freq / fs)
+    g = (1 + r) / 2
+    return _biquad([g, -g, 0], [1, -r, 0])
+
+
+Filter = Union[SOSFilter, FilterChain]
@@ -0,0 +1,177 @@
+"""
+BufferGroup
+-----------
+"""
+from liesl.buffers.ringbuffer import RingBuffer, _write_dumps
+from pylsl import StreamInfo
+from numpy import ndarray
+from typing import List, Tuple, Iterator, Union
+from pathlib import Path
+import threading
+import time
+
+
+class BufferGroup(threading.Thread):
+    """A group of ringbuffers subscribed to LSL outlets by a single thread
+
+    Instead of running one thread per stream, all inlets of the group are
+    serviced in turn by one thread, which reduces the number of threads
+    competing for the GIL. The member ringbuffers are not started themselves,
+    but can be read like any other :class:`~liesl.buffers.ringbuffer.RingBuffer`.
+
+    args
+    ----
+    streaminfos: List[StreamInfo]
+        identify the StreamOutlets and will be connected once the group started
+    duration_in_ms: float
+        the length of each ringbuffer in ms.
+    verbose:bool
+        how verbose the ringbuffers should be. defaults to False
+    **kwargs:
+        further keyword arguments passed on to every :class:`~liesl.buffers.ringbuffer.RingBuffer`
+
+
+    Example::
+
+       eeg = get_streaminfos_matching(type="EEG")[0]
+       emg = get_streaminfos_matching(type="EMG")[0]
+       group = BufferGroup(streaminfos=[eeg, emg], duration_in_ms=1000)
+       group.await_running()
+       time.sleep(1)
+       now = pylsl.local_clock()
+       (eeg, eeg_tstamps), (emg, emg_tstamps) = group.get_window(now - 0.5, now)
+
+    """
+
+    def __init__(
+        self,
+        streaminfos: List[StreamInfo],
+        duration_in_ms: float = 1000,
+        verbose: bool = False,
+        **kwargs
+    ) -> None:
+        threading.Thread.__init__(self)
+        self.buffers = [
+            RingBuffer(
+                streaminfo=sinfo,
+                duration_in_ms=duration_in_ms,
+                verbose=verbose,
+                **kwargs
+            )
+            for sinfo in streaminfos
+        ]
+        self._is_running = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self.buffers)
+
+    def __getitem__(self, idx: int) -> RingBuffer:
+        return self.buffers[idx]
+
+    def __iter__(self) -> Iterator[RingBuffer]:
+        return iter(self.buffers)
+
+    def reset(self):
+        "clear the buffers of all members and start collecting fresh"
+        for buffer in self.buffers:
+            buffer.reset()
+
+    def get(self) -> List[Tuple[ndarray, ndarray]]:
+        """get the current data with timestamps of all members
+
+        returns
+        -------
+        chunks: List[Tuple[ndarray, ndarray]]
+            the data and timestamps of each member in the order of the streaminfos
+        """
+        return [buffer.get() for buffer in self.buffers]
+
+    def get_window(
+        self, t_start: float, t_end: float
+    ) -> List[Tuple[ndarray, ndarray]]:
+        """get the time-aligned data of all members between two timestamps
+
+        args
+        ----
+        t_start: float
+            the earliest timestamp to return, in the local clock
+        t_end: float
+            the latest timestamp to return, in the local clock
+
+        returns
+        -------
+        chunks: List[Tuple[ndarray, ndarray]]
+            the data and timestamps within the window of each member in the order of the streaminfos
+        """
+        return [buffer.get_window(t_start, t_end) for buffer in self.buffers]
+
+    def dump(self, directory: Union[str, Path]) -> threading.Thread:
+        """write the current data of all members to disk without blocking
+
+        Every member is written like :meth:`RingBuffer.dump <liesl.buffers.ringbuffer.RingBuffer.dump>`
+        into its own file, named by its position in the group and the name of
+        its stream, e.g. 0_Liesl-Mock-EEG.npz.
+
+        args
+        ----
+        directory: Union[str, Path]
+            the directory for the files, which is created if missing
+
+        returns
+        -------
+        thread: threading.Thread
+            the thread writing the files, join it to wait until all files are complete
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        dumps = [
+            buffer._dump(directory / "{}_{}.npz".format(idx, buffer.streaminfo.name()))
+            for idx, buffer in enumerate(self.buffers)
+        ]
+        thread = threading.Thread(target=_write_dumps, args=(dumps,))
+        thread.start()
+        return thread
+
+    def stop(self):
+        "stop the subscription to all outlets"
+        self.is_running = False
+        self.join()
+
+    @property
+    def is_running(self):
+        "whether the group is receiving new data or not"
+        return self._is_running.is_set()
+
+    @is_running.setter
+    def is_running(self, state: bool):
+        if state:
+            self._is_running.set()
+        else:
+            self._is_running.clear()
+
+    def await_running(self):
+        "block until the group has subscribed to all LSL outlets"
+        print("[", end="")
+        try:
+            self.start()
+        except RuntimeError:  # pragma no cover
+            pass
+        while not self.is_running:
+            time.sleep(0.1)
+            print(".", end="")
+        print("]")
+
+    def run(self):
+        """"""
+        streams = [buffer._connect() for buffer in self.buffers]
+        for buffer in self.buffers:
+            buffer.is_running = True
+        self.is_running = True
+        while self.is_running:
+            count = 0
+            for buffer, stream in zip(self.buffers, streams):
+                count += buffer._pull(stream)
+            if not count:
+                time.sleep(0.001)  # no inlet had data, yield to other threads
+        for buffer in self.buffers:
+            buffer.is_running = False
@@ -0,0 +1,199 @@
+"""
+CompressedHistory
+-----------------
+"""
+from collections import deque
+from typing import List, Tuple, Union
+import zlib
+import numpy as np
+from numpy import ndarray
+
+#: the first and last timestamp, the timestamps and the samples of a block
+Block = Tuple[float, float, Union[bytes, ndarray], Union[bytes, ndarray]]
+
+
+class CompressedHistory:
+    """older samples of an integer stream, compressed in blocks
+
+    Samples are collected until they fill a block of blocklen samples. Each
+    block is then delta-encoded along time, i.e. only the differences between
+    consecutive samples are kept, which are small for most physiological
+    signals, and compressed with zlib channel by channel. Because integers
+    wrap around, the deltas are exact in the dtype of the stream. The
+    timestamps are compressed as well, from the second differences of
+    their bits, which are mostly tiny as consecutive timestamps differ by
+    about 1/fs. Blocks whose newest sample is more than duration_in_ms
+    older than the newest sample are dropped.
+
+    args
+    ----
+    columnlen: int
+        the number of channels
+    dtype: Union[str, np.dtype]
+        the integer dtype of the samples
+    duration_in_ms: float
+        how long to keep the samples in ms
+    blocklen: int
+        how many samples are compressed together
+    level: int
+        the zlib compression level from 1 (fastest) to 9 (smallest)
+
+
+    Example::
+
+        history = CompressedHistory(8, "int16", duration_in_ms=60_000)
+        history.put(evicted, evicted_tstamps)
+        chunk, tstamps = history.get(t_start, t_end)
+
+    """
+
+    def __init__(
+        self,
+        columnlen: int,
+        dtype: Union[str, np.dtype],
+        duration_in_ms: float,
+        blocklen: int = 1024,
+        level: int = 1,
+    ) -> None:
+        self.dtype = np.dtype(dtype)
+        if not np.issubdtype(self.dtype, np.integer):
+            raise ValueError("Compressed history requires an integer dtype")
+        self.columnlen = int(columnlen)
+        self.duration_in_ms = duration_in_ms
+        self.blocklen = int(blocklen)
+        self.level = int(level)
+        self.reset()
+
+    def reset(self):
+        "drop all samples"
+        self._blocks: deque = deque()
+        self._pending = np.empty((0, self.columnlen), dtype=self.dtype)
+        self._pending_tstamps = np.empty(0)
+        self.nbytes = 0  #: the size of the compressed data
+
+    def __len__(self) -> int:
+        return len(self._blocks) * self.blocklen + len(self._pending_tstamps)
+
+    def _compress(self, chunk: ndarray, tstamps: ndarray) -> Block:
+        deltas = np.diff(chunk, axis=0, prepend=np.zeros_like(chunk[:1]))
+        payload = zlib.compress(np.ascontiguousarray(deltas.T).tobytes(), self.level)
+        bits = np.ascontiguousarray(tstamps).view(np.int64)
+        deltas = np.diff(bits, n=2, prepend=[0, 0])
+        stamps = zlib.compress(deltas.tobytes(), self.level)
+        return (float(tstamps[0]), float(tstamps[-1]), stamps, payload)
+
+    def decode(self, block: Block) -> Tuple[ndarray, ndarray]:
+        """the samples and timestamps of a block as returned by :meth:`~.select`"""
+        first, last, stamps, payload = block
+        if isinstance(payload, ndarray):  # not compressed yet
+            return payload, stamps
+        deltas = np.frombuffer(zlib.decompress(stamps), dtype=np.int64)
+        tstamps = np.cumsum(np.cumsum(deltas)).view(np.float64)
+        deltas = np.frombuffer(zlib.decompress(payload), dtype=self.dtype)
+        deltas = deltas.reshape(self.columnlen, len(tstamps)).T
+        return np.cumsum(deltas, axis=0, dtype=self.dtype), tstamps
+
+    def put(self, chunk: ndarray, tstamps: ndarray):
+        """add samples which are newer than all samples added before
+
+        args
+        ----
+        chunk: ndarray
+            the samples (samples x channels)
+        tstamps: ndarray
+            the timestamps of each sample
+        """
+        tstamps = np.asarray(tstamps, dtype=np.float64).ravel()
+        if not len(tstamps):
+            return
+        chunk = np.asarray(chunk, dtype=self.dtype).reshape(-1, self.columnlen)
+        pending = np.concatenate((self._pending, chunk), axis=0)
+        pending_tstamps = np.concatenate((self._pending_tstamps, tstamps))
+        full = (len(pending) // self.blocklen) * self.blocklen
+        for start in range(0, full, self.blocklen):
+            stop = start + self.blocklen
+            block = self._compress(pending[start:stop], pending_tstamps[start:stop])
+            self._blocks.append(block)
+            self.nbytes += len(block[2]) + len(block[3])
+        self._pending = pending[full:]
+        self._pending_tstamps = pending_tstamps[full:]
+        stale = pending_tstamps[-1] - self.duration_in_ms / 1000
+        while self._blocks and self._blocks[0][1] < stale:
+            first, last, tstamps, payload = self._blocks.popleft()
+            self.nbytes -= len(tstamps) + len(payload)
+
+    def select(self, t_start: float, t_end: float) -> List[Block]:
+        """select the blocks overlapping a time span without decoding them
+
+        The uncompressed samples are copied, so that the blocks can be
+        decoded with :meth:`~.decode` while new samples are added.
+
+        args
+        ----
+        t_start: float
+            the earliest timestamp
+        t_end: float
+            the latest timestamp
+
+        returns
+        -------
+        blocks: List[Block]
+            the compressed or uncompressed blocks
+        """
+        blocks = [
+            block for block in self._blocks if block[0] <= t_end and block[1] >= t_start
+        ]
+        if len(self._pending_tstamps):
+            tstamps = self._pending_tstamps.copy()
+            blocks.append((tstamps[0], tstamps[-1], tstamps, self._pending.copy()))
+        return blocks
+
+    def read(
+        self, blocks: List[Block], t_start: float, t_end: float
+    ) -> Tuple[ndarray, ndarray]:
+        """decode the samples of selected blocks between two timestamps
+
+        args
+        ----
+        blocks: List[Block]
+            the blocks as returned by :meth:`~.select`
+        t_start: float
+            the earliest timestamp to return
+        t_end: float
+            the latest timestamp to return
+
+        returns
+        -------
+        chunk: ndarray
+            the samples within the time span (samples x channels)
+        tstamps: ndarray
+            the timestamps for each sample within the time span (samples x 1)
+        """
+        chunks = [np.empty((0, self.columnlen), dtype=self.dtype)]
+        tstamps = [np.empty(0)]
+        for block in blocks:
+            chunk, stamps = self.decode(block)
+            start = np.searchsorted(stamps, t_start, side="left")
+            stop = np.searchsorted(stamps, t_end, side="right")
+            chunks.append(chunk[start:stop])
+            tstamps.append(stamps[start:stop])
+        return np.concatenate(chunks), np.concatenate(tstamps)[:, None]
+
+    def get(self, t_start: float, t_end: float) -> Tuple[ndarray, ndarray]:
+        """get the samples and timestamps between two timestamps
+
+        args
+        ----
+        t_start: float
+            the earliest timestamp to return
+        t_end: float
+            the latest timestamp to return
+
+        returns
+        -------
+        chunk: ndarray
+            the samples within the time span (samples x channels)
+        tstamps: ndarray
+            the timestamps for each sample within the time span (samples x 1)
+        """
+        return self.read(self.select(t_start, t_end), t_start, t_end)
@@ -0,0 +1,129 @@
+"""
+Metrics
+-------
+"""
+import time
+from typing import Dict, List
+
+
+class Histogram:
+    """count non-negative integers in buckets of powers of two
+
+    Bucket k holds the values up to 2**k - 1, the last bucket all larger
+    values. Adding a value costs a few integer operations.
+
+    args
+    ----
+    buckets: int
+        the number of buckets
+    """
+
+    def __init__(self, buckets: int = 24) -> None:
+        self.counts: List[int] = [0] * int(buckets)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value: int):
+        "count a value, negative values are counted as 0"
+        value = max(int(value), 0)
+        self.counts[min(value.bit_length(), len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> dict:
+        """the histogram as a dictionary
+
+        returns
+        -------
+        snapshot: dict
+            count, mean, max and the non-empty buckets keyed by their inclusive upper bound
+        """
+        last = len(self.counts) - 1
+        buckets = {}
+        for k, n in enumerate(self.counts):
+            if n:
+                buckets["inf" if k == last else str(2 ** k - 1)] = n
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
+class BufferMetrics:
+    """counters and histograms of the acquisition of a ringbuffer
+
+    All durations are measured in microseconds.
+
+    Example::
+
+        rb = RingBuffer(streaminfo=sinfo)
+        rb.await_running()
+        rb.metrics.snapshot()["effective_srate"]
+
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self):
+        "restart all counters and histograms"
+        self.pulls = 0  #: how many chunks were pulled
+        self.idle_pulls = 0  #: how many pulls returned no samples
+        self.full_pulls = 0  #: how many pulls returned max_chunklen samples
+        self.overflows = 0  #: how many chunks did not fit into the ringbuffer
+        self.samples = 0  #: how many samples were pulled
+        self.chunk_size = Histogram()  #: samples per chunk
+        self.pull_us = Histogram()  #: pulling a chunk after its first sample
+        self.age_us = Histogram()  #: age of the newest sample when stored
+        self.lock_wait_us = Histogram()  #: waiting for the bufferlock
+        self.put_us = Histogram()  #: holding the bufferlock while storing
+        self._first = None
+        self._first_count = 0
+        self._last = None
+
+    def add_chunk(self, count: int, full: bool):
+        "count a pulled chunk of count samples"
+        now = time.perf_counter()
+        if self._first is None:
+            self._first = now
+            self._first_count = count
+        self._last = now
+        self.pulls += 1
+        self.samples += count
+        self.full_pulls += full
+        self.chunk_size.add(count)
+
+    @property
+    def effective_srate(self) -> float:
+        "how many samples were pulled per second"
+        if self._first is None or self._last == self._first:
+            return 0.0
+        # the samples of the first chunk arrived before the clock started
+        return (self.samples - self._first_count) / (self._last - self._first)
+
+    def snapshot(self) -> Dict[str, object]:
+        """all counters and histograms as a dictionary
+
+        returns
+        -------
+        snapshot: Dict[str, object]
+            the counters as int, the effective sampling rate in Hz as float and the histograms as dictionaries, see :meth:`Histogram.snapshot`
+        """
+        return {
+            "pulls": self.pulls,
+            "idle_pulls": self.idle_pulls,
+            "full_pulls": self.full_pulls,
+            "overflows": self.overflows,
+            "samples": self.samples,
+            "effective_srate": self.effective_srate,
+            "chunk_size": self.chunk_size.snapshot(),
+            "pull_us": self.pull_us.snapshot(),
+            "age_us": self.age_us.snapshot(),
+            "lock_wait_us": self.lock_wait_us.snapshot(),
+            "put_us": self.put_us.snapshot(),
+        }
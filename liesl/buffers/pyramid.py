@@ -0,0 +1,197 @@
+"""
+DecimationPyramid
+-----------------
+"""
+from liesl.buffers.ringbuffer import SimpleRingBuffer
+import numpy as np
+from numpy import ndarray
+from typing import Tuple, List
+import warnings
+
+
+class DecimationLevel:
+    def __init__(self, columnlen: int, factor: int, max_bins: int) -> None:
+        """a single level of a :class:`~.DecimationPyramid`
+
+        Combines every factor consecutive bins of its input into one bin
+        holding their min, max and mean. NaN inputs, e.g. gaps filled by the
+        ringbuffer, are ignored, so only a bin without any sample is NaN.
+        Inputs which do not yet fill a bin are kept until the next update.
+
+        args
+        ----
+        columnlen: int
+            the number of channels
+        factor: int
+            how many input bins are combined into one bin of this level
+        max_bins: int
+            how many bins this level keeps
+        """
+        self.columnlen = int(columnlen)
+        self.factor = int(factor)
+        self.bins = SimpleRingBuffer(
+            max_bins, 3 * self.columnlen, dtype=np.float64
+        )
+        self.tstamps = SimpleRingBuffer(max_bins, 1, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        "drop all bins and pending inputs"
+        self.bins.reset()
+        self.tstamps.reset()
+        self._pending = np.empty((0, 3 * self.columnlen))
+        self._pending_tstamps = np.empty(0)
+
+    def update(self, bins: ndarray, tstamps: ndarray) -> Tuple[ndarray, ndarray]:
+        """combine new input bins into the bins of this level
+
+        args
+        ----
+        bins: ndarray
+            the input bins as (bins x [min, max, mean] * channels)
+        tstamps: ndarray
+            the timestamp of the first sample of each input bin
+
+        returns
+        -------
+        bins: ndarray
+            the bins completed by this update as (bins x [min, max, mean] * channels)
+        tstamps: ndarray
+            the timestamp of the first sample of each completed bin
+        """
+        if len(self._pending):
+            bins = np.concatenate((self._pending, bins), axis=0)
+            tstamps = np.concatenate((self._pending_tstamps, tstamps))
+        n = (len(bins) // self.factor) * self.factor
+        self._pending = bins[n:].copy()
+        self._pending_tstamps = tstamps[n:].copy()
+        if n == 0:
+            return bins[:0], tstamps[:0]
+        c = self.columnlen
+        grouped = bins[:n].reshape(-1, self.factor, 3 * c)
+        with warnings.catch_warnings():  # bins without any sample stay NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            completed = np.concatenate(
+                (
+                    np.nanmin(grouped[:, :, :c], axis=1),
+                    np.nanmax(grouped[:, :, c : 2 * c], axis=1),
+                    np.nanmean(grouped[:, :, 2 * c :], axis=1),
+                ),
+                axis=1,
+            )
+        completed_tstamps = tstamps[:n : self.factor]
+        self.bins.put(completed)
+        self.tstamps.put(completed_tstamps[:, None])
+        return completed, completed_tstamps
+
+
+class DecimationPyramid:
+    """min, max and mean of a stream at several coarser resolutions
+
+    Every level combines factor bins of the level below into one bin, i.e.
+    level k summarizes factor**(k+1) samples per bin, and keeps max_bins of
+    them, covering factor**(k+1) * max_bins samples. Each :meth:`~.put` updates all levels incrementally, and
+    :meth:`~.get` returns a time span from the finest level which covers it
+    with at most npoints bins, so that a viewer can draw minutes to hours of
+    history at a fixed cost.
+
+    args
+    ----
+    columnlen: int
+        the number of channels
+    levels: int
+        the number of levels
+    factor: int
+        how many bins of a level are combined into one bin of the next level
+    max_bins: int
+        how many bins each level keeps
+
+
+    Example::
+
+        pyramid = DecimationPyramid(columnlen=8, levels=3, factor=10)
+        pyramid.put(chunk, tstamps)
+        mins, maxs, means, tstamps = pyramid.get(t_start, t_end, npoints=500)
+
+    """
+
+    def __init__(
+        self, columnlen: int, levels: int = 4, factor: int = 10, max_bins: int = 2000
+    ) -> None:
+        self.columnlen = int(columnlen)
+        self.factor = int(factor)
+        self.levels: List[DecimationLevel] = [
+            DecimationLevel(self.columnlen, self.factor, max_bins)
+            for level in range(int(levels))
+        ]
+
+    def reset(self):
+        "drop all bins of all levels"
+        for level in self.levels:
+            level.reset()
+
+    def put(self, chunk: ndarray, tstamps: ndarray):
+        """update all levels with a new chunk of samples
+
+        args
+        ----
+        chunk: ndarray
+            the new samples (samples x channels)
+        tstamps: ndarray
+            the timestamps of each sample
+        """
+        chunk = np.asarray(chunk, dtype=np.float64).reshape(-1, self.columnlen)
+        bins = np.concatenate((chunk, chunk, chunk), axis=1)
+        tstamps = np.asarray(tstamps, dtype=np.float64).ravel()
+        for level in self.levels:
+            bins, tstamps = level.update(bins, tstamps)
+            if not len(bins):
+                break
+
+    def select(self, t_start: float, t_end: float, npoints: int) -> DecimationLevel:
+        """select the finest level covering a time span with at most npoints bins"""
+        fallback = None
+        for level in self.levels:
+            start = level.tstamps.searchsorted(t_start, side="left")
+            stop = level.tstamps.searchsorted(t_end, side="right")
+            if stop - start > npoints:
+                continue
+            oldest = level.tstamps.get_range(0, 1)
+            if len(oldest) and oldest[0, 0] <= t_start:
+                return level
+            if fallback is None:  # does not reach back far enough
+                fallback = level
+        return self.levels[-1] if fallback is None else fallback
+
+    def get(
+        self, t_start: float, t_end: float, npoints: int = 1000
+    ) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        """get the min, max and mean of a time span with at most npoints bins
+
+        args
+        ----
+        t_start: float
+            the earliest timestamp to return
+        t_end: float
+            the latest timestamp to return
+        npoints: int
+            how many bins to return at most, unless even the coarsest level has more bins in that time span
+
+        returns
+        -------
+        mins: ndarray
+            the minimum of each bin (bins x channels)
+        maxs: ndarray
+            the maximum of each bin (bins x channels)
+        means: ndarray
+            the mean of each bin (bins x channels)
+        tstamps: ndarray
+            the timestamp of the first sample in each bin (bins x 1)
+        """
+        level = self.select(t_start, t_end, npoints)
+        start = level.tstamps.searchsorted(t_start, side="left")
+        stop = level.tstamps.searchsorted(t_end, side="right")
+        bins = level.bins.get_range(start, stop)
+        tstamps = level.tstamps.get_range(start, stop)
+        c = self.columnlen
+        return bins[:, :c], bins[:, c : 2 * c], bins[:, 2 * c :], tstamps
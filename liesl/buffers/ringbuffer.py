@@ -2,99 +2,1160 @@
 Ringbuffer
 ----------
 """
-from liesl.streams.convert import inlet_to_dict
-from pylsl import StreamInlet, StreamInfo
+from liesl.streams.convert import inlet_to_dict, channel_format_to_dtype
+from liesl.streams.convert import streaminfoxml_to_dict
+from liesl.buffers.filters import Filter, FilterChain
+from liesl.buffers.metrics import BufferMetrics
+from liesl.buffers.history import CompressedHistory
+from pylsl import StreamInlet, StreamInfo, local_clock
 import numpy as np
 from numpy import ndarray
-from typing import Union, Tuple
+from typing import Union, Tuple, List, Dict, Callable, TYPE_CHECKING
+from pathlib import Path
 import threading
+import json
+from collections import deque
+from contextlib import contextmanager
+import traceback
+import queue
+import itertools
+import weakref
+import mmap
 import time
 
+if TYPE_CHECKING:  # shared memory requires python >= 3.8
+    from multiprocessing.shared_memory import SharedMemory
+
 
 class SimpleRingBuffer:
-    def __init__(self, rowlen: int, columnlen: int, verbose=False) -> None:
+    def __init__(
+        self, rowlen: int, columnlen: int, verbose=False, dtype=float, slack: int = 0
+    ) -> None:
         """a simple ringbuffer
 
+        The storage is preallocated with a fixed capacity of rowlen samples
+        and written at a moving head, i.e. a put costs O(len(chunk)) and does
+        not allocate new memory once the buffer is running. With slack, the
+        storage holds additional rows beyond the rowlen samples of the
+        buffer, so that a sample is only overwritten rowlen + slack samples
+        later, e.g. while a reader still copies it.
+
+        args
+        ----
+        rowlen: int
+            the number of samples
+        columnlen:int
+            the number of channels
+        verbose:bool {False}
+            how verbose the buffer should be
+        dtype: {float}
+            the dtype of the internal storage. Chunks are cast into it.
+        slack: int {0}
+            the number of additional rows of the storage
+            
+        Example
+        -------
+            rb = SimpleRingBuffer(1000, 2)
+
+        """
+        self.max_row = int(rowlen)
+        self.max_column = int(columnlen)
+        self.verbose = verbose
+        self.dtype = np.dtype(dtype)
+        self.slack = int(slack)
+        self._data = self._allocate(self.max_row + self.slack)
+        self.count = 0  # how many samples were ever put, survives a reset
+        self._start = 0  # storage row of the oldest sample
+        self._len = 0  # number of valid samples
+        self._replaced = 0  # the count when the storage was last replaced
+
+    def _allocate(self, rowlen: int) -> np.ndarray:
+        "create the storage for rowlen samples"
+        return np.empty((rowlen, self.max_column), dtype=self.dtype)
+
+    def reset(self):
+        "empty the internal buffer"
+        # keep the write head, so that a row is only reused max_row samples later
+        if self._len:
+            self._start = (self._start + self._len) % self._data.shape[0]
+            self._len = 0
+
+    def frozen(self) -> "SimpleRingBuffer":
+        """a shallow copy for reading, whose state does not change with later puts
+
+        It shares the storage, so its rows are still overwritten by later
+        puts, unless the storage was replaced in the meantime.
+        """
+        frozen = SimpleRingBuffer.__new__(SimpleRingBuffer)
+        frozen.max_row, frozen.max_column = self.max_row, self.max_column
+        frozen.verbose, frozen.dtype = self.verbose, self.dtype
+        frozen.slack = self.slack
+        frozen._data, frozen.count = self._data, self.count
+        frozen._start, frozen._len = self._start, self._len
+        return frozen
+
+    def overwritten(self, frozen: "SimpleRingBuffer", first: int) -> int:
+        """how many rows of a frozen copy were overwritten since it was frozen
+
+        args
+        ----
+        frozen: SimpleRingBuffer
+            as returned by :meth:`~.frozen`
+        first: int
+            the count of the oldest row of interest
+
+        returns
+        -------
+        overwritten: int
+            the number of rows from first on which were overwritten
+        """
+        data = self._data
+        # the counter increases before a put overwrites any rows, and a row
+        # is overwritten when the row capacity samples later is put
+        count = self.count if data is frozen._data else self._replaced
+        return max(0, count - frozen.capacity - first)
+
+    def _segments(self, start: int = 0, stop: int = None) -> List[slice]:
+        "the storage slices holding the chronological rows [start:stop]"
+        stop = self._len if stop is None else stop
+        if stop <= start:
+            return []
+        capacity = self._data.shape[0]
+        a = (self._start + start) % capacity
+        b = a + (stop - start)
+        if b <= capacity:
+            return [slice(a, b)]
+        return [slice(a, capacity), slice(0, b - capacity)]
+
+    def put(self, chunk: Union[list, np.ndarray], transpose=False):
+        """append a chunk of data and overwrite the oldest samples
+
+        the chunk is copied to the write head of the preallocated storage,
+        wrapping around at its end
+        """
+        chunk = np.atleast_2d(chunk)
+        if transpose:
+            chunk = chunk.T
+
+        n = chunk.shape[0]
+        self.count += n
+        if n > self.max_row:
+            if self.verbose:
+                print("Ringbuffer Overflow")
+            chunk = chunk[-self.max_row :]
+            n = self.max_row
+        if n == 0:
+            return
+
+        capacity = self._data.shape[0]
+        head = (self._start + self._len) % capacity
+        first = min(n, capacity - head)
+        self._data[head : head + first] = chunk[:first]
+        self._data[: n - first] = chunk[first:]
+        self._len += n
+        if self._len > self.max_row:
+            self._start = (self._start + self._len - self.max_row) % capacity
+            self._len = self.max_row
+
+    def get(self) -> np.ndarray:
+        "return a copy of the internal buffer in chronological order"
+        return self.get_range(0, self._len)
+
+    def get_range(self, start: int, stop: int) -> np.ndarray:
+        "return a copy of the chronological rows [start:stop]"
+        segments = self._segments(start, stop)
+        if len(segments) < 2:
+            return np.array(self._data[segments[0] if segments else slice(0, 0)])
+        return np.concatenate([self._data[s] for s in segments], axis=0)
+
+    def copy_into(self, out: np.ndarray, start: int, stop: int) -> int:
+        """copy the chronological rows [start:stop] into the beginning of out
+
+        returns
+        -------
+        count: int
+            the number of rows written into out
+        """
+        row = 0
+        for s in self._segments(start, stop):
+            n = s.stop - s.start
+            out[row : row + n] = self._data[s]
+            row += n
+        return row
+
+    def views(self, start: int = 0, stop: int = None) -> List[np.ndarray]:
+        """return read-only views on the chronological rows [start:stop]
+
+        The rows are returned without copying as one or, if they wrap around
+        the end of the storage, two consecutive views. They are only valid
+        until the next put overwrites them.
+        """
+        data = self._export()
+        views = []
+        for s in self._segments(start, stop):
+            view = data[s]
+            view.flags.writeable = False
+            views.append(view)
+        return views
+
+    def _export(self) -> np.ndarray:
+        "the storage, on which views are handed out"
+        return self._data
+
+    def searchsorted(self, value: float, side: str = "left") -> int:
+        """find the chronological index where value would be inserted
+
+        Searches the first column, which has to be sorted in ascending
+        order, e.g. timestamps, in O(log N) without copying it.
+
+        args
+        ----
+        value: float
+            the value to search for
+        side: str {"left", "right"}
+            whether to return the first or last suitable index, as in np.searchsorted
+        """
+        offset = 0
+        for s in self._segments():
+            column = self._data[s, 0]
+            idx = int(np.searchsorted(column, value, side=side))
+            if idx < len(column):
+                return offset + idx
+            offset += len(column)
+        return offset
+
+    @property
+    def is_full(self) -> bool:
+        "whether the internal buffer is full or not"
+        return self._len == self.max_row
+
+    @property
+    def capacity(self) -> int:
+        "the number of rows of the storage, i.e. max_row and the slack"
+        return self._data.shape[0]
+
+    @property
+    def shape(self):
+        "the current size of the internal buffer"
+        return (self._len, self.max_column)
+
+    @property
+    def max_shape(self):
+        "the maximal size of the internal buffer"
+        return (self.max_row, self.max_column)
+
+
+class GrowingRingBuffer(SimpleRingBuffer):
+    def __init__(
+        self, columnlen: int, chunklen: int = 256, verbose=False, dtype=float
+    ) -> None:
+        """a ringbuffer whose capacity follows the amount of data it holds
+
+        Instead of overwriting the oldest samples, the storage grows in blocks
+        of chunklen samples when a put would not fit. Old samples are only
+        dropped by :meth:`~.discard`, which shrinks the storage again once
+        more than two blocks are unused.
+
+        args
+        ----
+        columnlen:int
+            the number of channels
+        chunklen: int
+            the number of samples by which the storage grows or shrinks
+        verbose:bool {False}
+            how verbose the buffer should be
+        dtype: {float}
+            the dtype of the internal storage. Chunks are cast into it.
+
+        Example
+        -------
+            rb = GrowingRingBuffer(2)
+
+        """
+        self.chunklen = int(chunklen)
+        super().__init__(
+            rowlen=self.chunklen, columnlen=columnlen, verbose=verbose, dtype=dtype
+        )
+
+    def _resize(self, rowlen: int):
+        "move the samples into a new storage of rowlen samples"
+        rowlen = max(self.chunklen, -(-rowlen // self.chunklen) * self.chunklen)
+        data = self._allocate(rowlen)
+        self.copy_into(data, 0, self._len)
+        self._replaced = self.count  # before readers can see the new storage
+        self._data = data
+        self._start = 0
+        self.max_row = rowlen
+
+    def put(self, chunk: Union[list, np.ndarray], transpose=False):
+        """append a chunk of data and grow the storage if necessary"""
+        chunk = np.atleast_2d(chunk)
+        if transpose:
+            chunk = chunk.T
+        if self._len + chunk.shape[0] > self.max_row:
+            self._resize(self._len + chunk.shape[0])
+        super().put(chunk)
+
+    def discard(self, n: int):
+        """drop the n oldest samples and shrink the storage if it is mostly unused"""
+        n = min(int(n), self._len)
+        if n <= 0:
+            return
+        self._start = (self._start + n) % self.max_row
+        self._len -= n
+        if self.max_row - self._len > 2 * self.chunklen:
+            self._resize(self._len + self.chunklen)
+
+
+class MemmapRingBuffer(SimpleRingBuffer):
+    def __init__(
+        self,
+        filename: Union[str, Path],
+        rowlen: int,
+        columnlen: int,
+        verbose=False,
+        dtype=float,
+        slack: int = 0,
+    ) -> None:
+        """a ringbuffer stored in a memory-mapped file instead of RAM
+
+        The storage starts at a page boundary of the file, whose size is
+        rounded up to whole pages, and the OS page cache decides which parts
+        of the history reside in memory. :meth:`~.views` returns slices backed by
+        the file. An existing file will be overwritten.
+
+        args
+        ----
+        filename: Union[str, Path]
+            where to store the samples
+        rowlen: int
+            the number of samples
+        columnlen:int
+            the number of channels
+        verbose:bool {False}
+            how verbose the buffer should be
+        dtype: {float}
+            the dtype of the internal storage. Chunks are cast into it.
+        slack: int {0}
+            the number of additional rows of the storage, see :class:`~.SimpleRingBuffer`
+
+        Example
+        -------
+            rb = MemmapRingBuffer("history.dat", 1000, 2)
+
+        """
+        self.filename = Path(filename)
+        super().__init__(
+            rowlen=rowlen,
+            columnlen=columnlen,
+            verbose=verbose,
+            dtype=dtype,
+            slack=slack,
+        )
+
+    def _allocate(self, rowlen: int) -> np.ndarray:
+        "map the storage for rowlen samples to a file of whole pages"
+        if self.dtype == object:
+            raise ValueError("Only numeric data can be stored in a file")
+        size = rowlen * self.max_column
+        pages = max(1, -(-size * self.dtype.itemsize // mmap.PAGESIZE))
+        data = np.memmap(
+            self.filename,
+            dtype=self.dtype,
+            mode="w+",
+            shape=(pages * mmap.PAGESIZE // self.dtype.itemsize,),
+        )
+        return data[:size].reshape(rowlen, self.max_column)
+
+    def flush(self):
+        "write all changes to the file"
+        self._data.flush()
+
+
+class SharedRingBuffer(SimpleRingBuffer):
+    _header_size = 128  # int64 slots, the dtype and padding
+    _created: set = set()  # the names of the blocks created by this process
+
+    def __init__(
+        self,
+        name: str,
+        rowlen: int,
+        columnlen: int,
+        verbose=False,
+        dtype=float,
+        create: bool = True,
+        slack: int = 0,
+    ) -> None:
+        """a ringbuffer in shared memory, which other processes can read
+
+        The header of the shared memory block holds the position of the
+        oldest sample, the number of samples, :attr:`count`, the shape, the
+        dtype, a :attr:`sequence` counter, an :attr:`offset` and the slack,
+        followed by the storage. A process attaching to an existing block with
+        :meth:`~.attach` sees every put of the creator, but can not put
+        itself.
+
+        args
+        ----
+        name: str
+            the name of the shared memory block
+        rowlen: int
+            the number of samples
+        columnlen:int
+            the number of channels
+        verbose:bool {False}
+            how verbose the buffer should be
+        dtype: {float}
+            the dtype of the internal storage. Chunks are cast into it.
+        create: bool {True}
+            whether to create the block, which fails if it exists already, or to attach to it
+        slack: int {0}
+            the number of additional rows of the storage, see :class:`~.SimpleRingBuffer`
+
+        Example
+        -------
+            rb = SharedRingBuffer("eeg", 1000, 2)
+            reader = SharedRingBuffer.attach("eeg")
+
+        """
+        self.name = name
+        self.create = create
+        self._exports = weakref.WeakValueDictionary()  # arrays handed out
+        self._numbers = itertools.count()
+        super().__init__(
+            rowlen=rowlen,
+            columnlen=columnlen,
+            verbose=verbose,
+            dtype=dtype,
+            slack=slack,
+        )
+
+    @classmethod
+    def attach(cls, name: str, verbose=False) -> "SharedRingBuffer":
+        "attach to the shared memory block of another SharedRingBuffer"
+        shm = cls._open(name)
+        header = np.ndarray((8,), dtype=np.int64, buffer=shm.buf)
+        rows, columnlen, slack = int(header[3]), int(header[4]), int(header[7])
+        dtype = bytes(shm.buf[64:96]).rstrip(b"\0").decode()
+        del header  # the block can only be closed without views on it
+        shm.close()
+        return cls(
+            name, rows - slack, columnlen, verbose, dtype, create=False, slack=slack
+        )
+
+    @staticmethod
+    def _open(name: str, size: int = 0) -> "SharedMemory":
+        "create or attach to a block, which is only released by its creator"
+        try:
+            from multiprocessing import resource_tracker
+            from multiprocessing.shared_memory import SharedMemory
+        except ImportError:  # pragma no cover
+            raise RuntimeError("Shared memory requires python >= 3.8")
+        if size:
+            shm = SharedMemory(name, create=True, size=size)
+            SharedRingBuffer._created.add(shm.name)
+            return shm
+        try:
+            return SharedMemory(name, track=False)  # python >= 3.13
+        except TypeError:
+            shm = SharedMemory(name)
+            if shm.name not in SharedRingBuffer._created:
+                # otherwise, the block is released when this process exits
+                resource_tracker.unregister(shm._name, "shared_memory")
+            return shm
+
+    def _allocate(self, rowlen: int) -> np.ndarray:
+        "create or attach to the header and storage for rowlen samples"
+        if self.dtype == object:
+            raise ValueError("Only numeric data can be stored in shared memory")
+        size = rowlen * self.max_column * self.dtype.itemsize
+        size = self._header_size + size if self.create else 0
+        self._shm = self._open(self.name, size)
+        self._header = np.ndarray((8,), dtype=np.int64, buffer=self._shm.buf)
+        if self.create:
+            self._header[:] = 0
+            self._header[3:5] = rowlen, self.max_column
+            self._header[7] = self.slack
+            self._shm.buf[64:96] = self.dtype.str.encode().ljust(32, b"\0")
+        return np.ndarray(
+            (rowlen, self.max_column),
+            dtype=self.dtype,
+            buffer=self._shm.buf,
+            offset=self._header_size,
+        )
+
+    # the state is kept in the header, and only the creator can change it
+    @property
+    def _start(self) -> int:
+        return int(self._header[0])
+
+    @_start.setter
+    def _start(self, value: int):
+        if self.create:
+            self._header[0] = value
+
+    @property
+    def _len(self) -> int:
+        return int(self._header[1])
+
+    @_len.setter
+    def _len(self, value: int):
+        if self.create:
+            self._header[1] = value
+
+    @property
+    def count(self) -> int:
+        "how many samples were ever put, survives a reset"
+        return int(self._header[2])
+
+    @count.setter
+    def count(self, value: int):
+        if self.create:
+            self._header[2] = value
+
+    @property
+    def offset(self) -> float:
+        "a clock offset, e.g. of the timestamps, to share with the attached processes"
+        return float(self._header[6:7].view(np.float64)[0])
+
+    @offset.setter
+    def offset(self, value: float):
+        self._header[6:7].view(np.float64)[0] = value
+
+    @property
+    def sequence(self) -> np.ndarray:
+        "the sequence counter of a :class:`SeqLock` protecting the block"
+        return self._track(40, 1, np.int64)
+
+    def _track(self, offset: int, count: int, dtype) -> np.ndarray:
+        "a new array on the block, which keeps it open until the array is deleted"
+        # the array and all arrays derived from it hold an export of the
+        # block through the memoryview numpy creates as their base
+        array = np.frombuffer(self._shm.buf, dtype=dtype, count=count, offset=offset)
+        self._exports[next(self._numbers)] = array.base
+        return array
+
+    def _export(self) -> np.ndarray:
+        "the storage, on which views are handed out and tracked"
+        array = self._track(self._header_size, self._data.size, self.dtype)
+        return array.reshape(self._data.shape)
+
+    def frozen(self) -> SimpleRingBuffer:
+        """a shallow copy for reading, whose state does not change with later puts
+
+        Views on the frozen copy are tracked like views on the block.
+        """
+        frozen = super().frozen()
+        frozen._export = self._export
+        return frozen
+
+    def _check_views(self):
+        "raise a BufferError if arrays handed out on the block are alive"
+        if len(self._exports):
+            raise BufferError(f"Views on the shared memory {self.name} are alive")
+
+    def close(self):
+        """detach from the shared memory block and release it if it was created here
+
+        All views on the storage, e.g. from :meth:`~.views`, and the
+        :attr:`sequence` counter have to be deleted before. Otherwise, a
+        BufferError is raised, because reading them afterwards would crash.
+        """
+        self._check_views()
+        del self._data, self._header
+        self._shm.close()
+        if self.create:
+            self._shm.unlink()
+            SharedRingBuffer._created.discard(self._shm.name)
+
+
+# -------------------------------------------------------------------------------
+
+Subscriber = Callable[[ndarray, ndarray], None]  #: receives chunk and tstamps
+
+TOLERANCE = 1e-9  #: in s, timestamps closer than this to a window edge are included
+INFO_TIMEOUT = 5.0  #: in s, how long to wait for the description of a stream
+GAP_TOLERANCE = 0.003  #: in s, how late a timestamp may always be without a gap
+GAP_JITTER = 2  #: how many times the observed jitter a timestamp may be late
+GAP_WARMUP = 0.25  #: in s, how long the jitter is observed before gaps are detected
+READ_SLACK = 2  #: in chunks of max_chunklen, how much may be put while a reader copies
+
+
+Dump = Tuple[Union[str, Path], ndarray, ndarray, dict]
+
+
+def _write_dumps(dumps: List[Dump]):
+    "write snapshots of ringbuffers to disk, see :meth:`RingBuffer.dump`"
+    for path, chunk, tstamps, info in dumps:
+        if chunk.dtype == object:  # strings, stored without pickling
+            chunk = chunk.astype(str)
+        np.savez(path, data=chunk, tstamps=tstamps, info=json.dumps(info))
+
+
+def load_dump(path: Union[str, Path]) -> Tuple[ndarray, ndarray, dict]:
+    """load a snapshot written by :meth:`RingBuffer.dump`
+
+    args
+    ----
+    path: Union[str, Path]
+        the .npz file of the snapshot
+
+    returns
+    -------
+    chunk: ndarray
+        the data (usually in samples x channels)
+    tstamps: ndarray
+        the timestamps for each sample in the local clock
+    info: dict
+        the information about the stream, see :func:`~liesl.streams.convert.inlet_to_dict`
+
+    Pickled arrays are refused, because unpickling can run arbitrary code.
+    """
+    with np.load(path, allow_pickle=False) as dump:
+        chunk = dump["data"]
+        if chunk.dtype.kind == "U":  # strings, as stored in the ringbuffer
+            chunk = chunk.astype(object)
+        return chunk, dump["tstamps"], json.loads(str(dump["info"]))
+
+
+class SeqLock:
+    """a sequence counter letting a single writer publish without waiting for readers
+
+    The writer makes the sequence odd before it changes the data and even
+    again afterwards, while holding the fallback lock. A reader copies the
+    data without any lock, and repeats the copy if the sequence was odd or
+    changed in the meantime, because it might have seen a partial change.
+    Only if it did not succeed within timeout, the reader acquires the
+    fallback lock and lets the writer wait once, or raises a TimeoutError
+    without a fallback lock, e.g. if the writer crashed during a write
+    in another process. Reads should therefore be
+    short, e.g. of the state of a ringbuffer, see
+    :meth:`RingBufferReader._read` for copying its rows.
+
+    args
+    ----
+    lock: Union[None, threading.Lock]
+        the fallback lock, which the writer holds while writing. None for readers in other processes, which then raise a TimeoutError after the timeout
+    timeout: float
+        how long in s a reader tries without the lock
+    counter: Union[None, ndarray]
+        an int64 array whose first element stores the sequence, e.g. in shared memory. defaults to None, i.e. a new array
+
+
+    Example::
+
+        with seqlock.write():
+            ring.put(chunk)
+        data = seqlock.read(ring.get)
+
+    """
+
+    def __init__(
+        self,
+        lock: Union[None, threading.Lock],
+        timeout: float = 0.01,
+        counter: Union[None, ndarray] = None,
+    ) -> None:
+        self.lock = lock
+        self.timeout = float(timeout)
+        self._counter = np.zeros(1, dtype=np.int64) if counter is None else counter
+
+    @property
+    def sequence(self) -> int:
+        "the number of started and finished writes"
+        return int(self._counter[0])
+
+    @sequence.setter
+    def sequence(self, value: int):
+        self._counter[0] = value
+
+    @contextmanager
+    def write(self):
+        "mark a change of the data, requires holding the fallback lock"
+        self.sequence += 1
+        try:
+            yield
+        finally:
+            self.sequence += 1
+
+    def read(self, fn: Callable[[], object]) -> object:
+        """call a function reading the data until it saw a consistent state
+
+        args
+        ----
+        fn: Callable[[], object]
+            copies the data, it must not have other side effects than writing into its own output
+
+        returns
+        -------
+        result: object
+            the result of fn
+
+        raises
+        ------
+        TimeoutError
+            if there is no fallback lock and no consistent state was seen within the timeout
+        """
+        deadline = time.perf_counter() + self.timeout
+        while time.perf_counter() < deadline:
+            before = self.sequence
+            if not before % 2:
+                try:
+                    result = fn()
+                except Exception:  # it read a partial change
+                    if self.sequence == before:
+                        raise
+                else:
+                    if self.sequence == before:
+                        return result
+            time.sleep(0)  # let the writer finish
+        if self.lock is None:
+            raise TimeoutError("The writer did not finish within the timeout")
+        with self.lock:
+            return fn()
+
+
+class SubscriberThread(threading.Thread):
+    """call a subscriber from its own thread
+
+    Chunks are queued without blocking the acquisition thread, and handed to
+    the subscriber in the order they arrived.
+
+    args
+    ----
+    callback: Subscriber
+        called with every chunk and its timestamps
+    """
+
+    def __init__(self, callback: Subscriber) -> None:
+        threading.Thread.__init__(self, daemon=True)
+        self.callback = callback
+        self.queue = queue.Queue()
+        self.start()
+
+    def __call__(self, chunk: ndarray, tstamps: ndarray):
+        self.queue.put((chunk, tstamps))
+
+    def stop(self):
+        "finish the queued chunks and stop the thread"
+        self.queue.put(None)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            try:
+                self.callback(*item)
+            except Exception:
+                traceback.print_exc()
+
+
+class RingBufferReader:
+    """the methods reading data and timestamps from a ringbuffer
+
+    Requires the attributes buffer and tstamps, holding the samples and
+    their timestamps in the clock of the stream, offset, converting them into
+    the local clock, and a :class:`~.SeqLock` as _seqlock.
+    """
+
+    fill_gaps = False
+
+    def _freeze(self) -> Tuple[SimpleRingBuffer, SimpleRingBuffer]:
+        "the current state of data and timestamps, call it through the SeqLock"
+        return self.buffer.frozen(), self.tstamps.frozen()
+
+    def _read(
+        self, fn: Callable[[SimpleRingBuffer, SimpleRingBuffer], Tuple[object, int]]
+    ) -> object:
+        """copy rows of data and timestamps without locking them
+
+        Only the state of the buffers is read through the :class:`~.SeqLock`.
+        The rows are copied afterwards while the writer may continue, whose
+        puts first fill the slack rows of the storage beyond the ringbuffer.
+        As samples are only appended, the copy is valid if none of its rows
+        was overwritten. Only if the slack was exhausted during the copy, it
+        is repeated, and after the timeout of the SeqLock done while holding
+        its lock, or a TimeoutError is raised if it has none.
+
+        args
+        ----
+        fn: Callable[[SimpleRingBuffer, SimpleRingBuffer], Tuple[object, int]]
+            copies from the frozen data and timestamps and returns its result and the cursor of its oldest row
+
+        returns
+        -------
+        result: object
+            the result of fn
+        """
+        lock = self._seqlock.lock
+        deadline = time.perf_counter() + self._seqlock.timeout
+        while time.perf_counter() < deadline:
+            buffer, tstamps = self._seqlock.read(self._freeze)
+            result, first = fn(buffer, tstamps)
+            if not (
+                self.buffer.overwritten(buffer, first)
+                or self.tstamps.overwritten(tstamps, first)
+            ):
+                return result
+            time.sleep(0)  # let the writer continue
+        if lock is None:
+            raise TimeoutError("The rows were overwritten during every copy")
+        with lock:
+            return fn(self.buffer, self.tstamps)[0]
+
+    def get_data(self) -> ndarray:
+        """get only the current data without timestamps
+
+        returns
+        -------
+        chunk: ndarray
+            the data (usually in samples x channels)
+        
+        
+        """
+
+        def read(buffer, tstamps):
+            return buffer.get(), buffer.count - buffer.shape[0]
+
+        return self._read(read)
+
+    def get(self) -> Tuple[ndarray, ndarray]:
+        """get the current data with timestamps
+        
+        returns
+        -------
+        chunk: ndarray
+            the data (usually in samples x channels)
+        tstamps: ndarray
+            the timestamps for each sample       
+        
+        """
+
+        def read(buffer, tstamps):
+            first = buffer.count - buffer.shape[0]
+            return (buffer.get(), tstamps.get()), first
+
+        buffer, tstamps = self._read(read)
+        tstamps += self.offset
+        return buffer, tstamps
+
+    @property
+    def cursor(self) -> int:
+        """the number of samples received since the ringbuffer was created
+
+        The counter increases monotonically, also across :meth:`~.reset`, and
+        can be passed to :meth:`~.get_since` to receive only newer samples.
+        """
+        return self.buffer.count
+
+    def get_since(self, cursor: int) -> Tuple[ndarray, ndarray, int]:
+        """get only the data and timestamps received after the cursor
+
+        Every consumer keeps its own cursor, so that any number of
+        independent readers can poll the same ringbuffer. If the cursor is so
+        old that samples were already discarded, only the samples still in
+        the buffer are returned.
+
+        args
+        ----
+        cursor: int
+            the cursor as returned from the previous call or :attr:`~.cursor`
+
+        returns
+        -------
+        chunk: ndarray
+            the new data (usually in samples x channels)
+        tstamps: ndarray
+            the timestamps for each new sample
+        cursor: int
+            the cursor to pass to the next call
+
+
+        Example::
+
+            cursor = 0
+            while True:
+                chunk, tstamps, cursor = rb.get_since(cursor)
+        """
+
+        def read(buffer, tstamps):
+            count = buffer.count
+            stop = buffer.shape[0]
+            start = min(stop, max(0, stop - (count - int(cursor))))
+            chunk = buffer.get_range(start, stop)
+            return (chunk, tstamps.get_range(start, stop), count), count - stop + start
+
+        buffer, tstamps, count = self._read(read)
+        tstamps += self.offset
+        return buffer, tstamps, count
+
+    def get_window(self, t_start: float, t_end: float) -> Tuple[ndarray, ndarray]:
+        """get the data and timestamps between two timestamps
+
+        The window is found with a binary search on the timestamps, or with
+        fill_gaps in constant time, see :meth:`~.index_at`. Only the samples
+        within the window are copied.
+
         args
         ----
-        rowlen: int
-            the number of samples
-        columnlen:int
-            the number of channels
-        verbose:bool {False}
-            how verbose the buffer should be
-            
-        Example
+        t_start: float
+            the earliest timestamp to return, in the local clock, i.e. corrected like the timestamps returned by :meth:`~.get`
+        t_end: float
+            the latest timestamp to return, in the local clock
+
+        returns
         -------
-            rb = SimpleRingBuffer(1000, 2)
+        chunk: ndarray
+            the data within the window (usually in samples x channels)
+        tstamps: ndarray
+            the timestamps for each sample within the window
+        """
+
+        def read(buffer, tstamps):
+            if self.fill_gaps:  # the nearest samples, unless outside of the window
+                length = tstamps.shape[0]
+                start = self._index_at(tstamps, t_start - self.offset)
+                stop = self._index_at(tstamps, t_end - self.offset) + 1
+                start, stop = min(max(0, start), length), min(max(0, stop), length)
+                edge = t_start - self.offset - TOLERANCE
+                if start < stop and tstamps.get_range(start, start + 1)[0, 0] < edge:
+                    start += 1
+                edge = t_end - self.offset + TOLERANCE
+                if start < stop and tstamps.get_range(stop - 1, stop)[0, 0] > edge:
+                    stop -= 1
+            else:  # adding and removing the offset can round by a few ulp
+                start = tstamps.searchsorted(
+                    t_start - self.offset - TOLERANCE, side="left"
+                )
+                stop = tstamps.searchsorted(
+                    t_end - self.offset + TOLERANCE, side="right"
+                )
+            first = buffer.count - buffer.shape[0] + start
+            chunk = buffer.get_range(start, stop)
+            return (chunk, tstamps.get_range(start, stop)), first
+
+        buffer, tstamps = self._read(read)
+        tstamps += self.offset
+        return buffer, tstamps
+
+    def get_around(
+        self, tstamp: float, pre_in_ms: float = 30, post_in_ms: float = 75
+    ) -> Tuple[ndarray, ndarray]:
+        """get the data and timestamps around a timestamp, e.g. of a trigger
+
+        args
+        ----
+        tstamp: float
+            the timestamp of the event in the local clock, e.g. as received from pylsl.local_clock()
+        pre_in_ms: float
+            how many milliseconds to return before the event
+        post_in_ms: float
+            how many milliseconds to return after the event
 
+        returns
+        -------
+        chunk: ndarray
+            the data around the event (usually in samples x channels)
+        tstamps: ndarray
+            the timestamps for each sample around the event
         """
-        self.max_row = int(rowlen)
-        self.max_column = int(columnlen)
-        self.verbose = verbose
-        self.reset()
+        return self.get_window(
+            tstamp - pre_in_ms / 1000, tstamp + post_in_ms / 1000
+        )
 
-    def reset(self):
-        "empty the internal buffer"
-        self.buffer = np.empty((0, self.max_column))
+    def snapshot(self, last: int = None) -> Tuple[ndarray, ndarray]:
+        """get a read-only snapshot of the most recent data with timestamps
 
-    def put(self, chunk: Union[list, np.ndarray], transpose=False):
-        """append a chunk of data and delete old samples
-        
-        should be faster than the implementation using np.roll according to 
-        https://gist.github.com/cchwala/dea03fb55d9a50660bd52e00f5691db5
-        
+        Only the requested samples are copied.
+
+        args
+        ----
+        last: int
+            how many of the most recent samples to return. defaults to None, i.e. all samples currently in the buffer
+
+        returns
+        -------
+        chunk: ndarray
+            the read-only data (usually in samples x channels)
+        tstamps: ndarray
+            the read-only timestamps for each sample
         """
-        chunk = np.atleast_2d(chunk)
-        if self.verbose:
-            if chunk.shape[0] > self.max_row:
-                print("Ringbuffer Overflow")
 
-        if transpose:
-            chunk = chunk.T
+        def read(buffer, tstamps):
+            stop = tstamps.shape[0]
+            start = 0 if last is None else max(0, stop - int(last))
+            first = buffer.count - stop + start
+            chunk = buffer.get_range(start, stop)
+            return (chunk, tstamps.get_range(start, stop)), first
 
-        buffer = np.atleast_2d(np.concatenate((self.buffer, chunk), axis=0))
-        if buffer.shape[0] > self.max_row:
-            self.buffer = buffer[-self.max_row :, :]
-        else:
-            self.buffer = buffer
+        buffer, tstamps = self._read(read)
+        tstamps += self.offset
+        buffer.flags.writeable = False
+        tstamps.flags.writeable = False
+        return buffer, tstamps
 
-    def get(self) -> np.ndarray:
-        "return a copy of the internal buffer"
-        return self.buffer.copy()
+    def get_into(self, out_data: ndarray, out_tstamps: ndarray) -> int:
+        """fill preallocated arrays with the most recent data and timestamps
 
-    @property
-    def is_full(self) -> bool:
-        "whether the internal buffer is full or not"
-        return self.buffer.shape[0] == self.max_row
+        Copies at most len(out_data) of the most recent samples into the
+        beginning of out_data and out_tstamps, without allocating new arrays.
+
+        args
+        ----
+        out_data: ndarray
+            the destination for the data, of shape (samples x channels)
+        out_tstamps: ndarray
+            the destination for the timestamps, of shape (samples,) or (samples x 1)
+
+        returns
+        -------
+        count: int
+            how many samples were written, at most len(out_data)
+
+
+        Example::
+
+            data = np.empty(rb.max_shape)
+            tstamps = np.empty(rb.max_shape[0])
+            count = rb.get_into(data, tstamps)
+            chunk, tstamps = data[:count], tstamps[:count]
+        """
+        if len(out_tstamps) < len(out_data):
+            raise ValueError("out_tstamps must have at least as many rows as data")
+        if out_tstamps.ndim == 1:
+            out_tstamps = out_tstamps[:, None]
+
+        def read(buffer, tstamps):
+            stop = tstamps.shape[0]
+            start = max(0, stop - len(out_data))
+            buffer.copy_into(out_data, start, stop)
+            count = tstamps.copy_into(out_tstamps, start, stop)
+            return count, buffer.count - stop + start
+
+        count = self._read(read)
+        out_tstamps[:count] += self.offset
+        return count
 
     @property
-    def shape(self):
-        "the current size of the internal buffer"
+    def shape(self) -> Tuple[int, int]:
+        "the current size of the data currently in the ringbuffer"
         return self.buffer.shape
 
     @property
-    def max_shape(self):
-        "the maximal size of the internal buffer"
-        return (self.max_row, self.max_column)
+    def max_shape(self) -> Tuple[int, int]:
+        "the maximal size of the ringbuffer"
+        return self.buffer.max_shape
+
+    @property
+    def is_full(self) -> bool:
+        "whether the ringbuffer is full"
+        return self.buffer.shape[0] == self.buffer.max_shape[0]
 
+    def views(self, last: int = None) -> Tuple[List[ndarray], List[ndarray], int]:
+        """get read-only views on the most recent data and timestamps
 
-# -------------------------------------------------------------------------------
+        Nothing is copied, so the views are only valid until the samples
+        are overwritten by new ones. Check with :meth:`~.intact` after using
+        them.
+
+        args
+        ----
+        last: int
+            how many of the most recent samples to return. defaults to None, i.e. all samples currently in the buffer
+
+        returns
+        -------
+        chunks: List[ndarray]
+            one or, if the samples wrap around the end of the storage, two consecutive views on the data
+        tstamps: List[ndarray]
+            the views on the timestamps in the clock of the stream, i.e. before adding :attr:`offset`
+        first: int
+            the cursor of the first sample, see :attr:`~.cursor`
+
+
+        Example::
+
+            chunks, tstamps, first = rb.views(last=500)
+            power = sum(np.square(chunk).sum(axis=0) for chunk in chunks)
+            if rb.intact(first):
+                print(power)
+        """
+
+        def read(buffer, tstamps):
+            stop = tstamps.shape[0]
+            start = 0 if last is None else max(0, stop - int(last))
+            first = buffer.count - (stop - start)
+            chunks = buffer.views(start, stop)
+            return (chunks, tstamps.views(start, stop), first), first
+
+        return self._read(read)
+
+    def intact(self, first: int) -> bool:
+        """whether no sample since a cursor was overwritten yet
+
+        args
+        ----
+        first: int
+            the cursor of the oldest sample of interest, e.g. as returned by :meth:`~.views`
+        """
+        # the counter increases before a put overwrites any samples
+        return first >= self.buffer.count - self.buffer.capacity
+
+    def _close_shared(self):
+        "close the shared storage, unless views on it are still alive"
+        lock, timeout = self._seqlock.lock, self._seqlock.timeout
+        self._seqlock = SeqLock(lock, timeout)  # its counter is in the block
+        try:
+            self.tstamps._check_views()
+            self.buffer.close()
+        except BufferError:
+            self._seqlock = SeqLock(lock, timeout, counter=self.buffer.sequence)
+            raise
+        self.tstamps.close()
 
 
-class RingBuffer(threading.Thread):
+class RingBuffer(RingBufferReader, threading.Thread):
     """A ringbuffer subscribed to an LSL outlet
     
-    The ringbuffer automatically updating itself as a thread.
+    The ringbuffer automatically updating itself as a thread. Counters and
+    histograms of the acquisition are available from
+    :class:`metrics <liesl.buffers.metrics.BufferMetrics>`. Readers copy
+    the data without locking it, see :class:`~.SeqLock`, so that the
+    acquisition does not wait for them.
 
     args
     ----
     streaminfo: StreamInfo
         identifies the StreamOutlet and will be connected once the buffer started
     duration_in_ms: float
-        the length of the ringbuffer in ms. is automatically converted into samples based on the nominal sampling rate of the LSL Outlet. All data older than duration_in_ms (normalized by expected samples) will be discarded
+        the length of the ringbuffer in ms. is automatically converted into samples based on the nominal sampling rate of the LSL Outlet. All data older than duration_in_ms (normalized by expected samples) will be discarded. For streams with an irregular sampling rate, all samples whose timestamp is more than duration_in_ms older than the newest timestamp will be discarded, and the storage grows and shrinks with the number of samples this leaves.
     verbose:bool
         how verbose the ringbuffer should be. defaults to False
+    dtype: Union[None, str, np.dtype]
+        the dtype used to store the data. defaults to None, i.e. the native channel_format of the stream. The timestamps are always stored as float64.
+    max_chunklen: int
+        the maximal number of samples pulled at once. Numeric chunks are pulled directly into a reusable array of this length. The storage holds :data:`READ_SLACK` times as many samples beyond the ringbuffer, so that readers copy without locking while new chunks are put. defaults to 1024
+    pyramid_levels: int
+        how many levels of min, max and mean at coarser resolution to keep in a :class:`~liesl.buffers.pyramid.DecimationPyramid` alongside the ringbuffer for long overviews, see :meth:`~.get_decimated`. defaults to 0, i.e. no pyramid
+    pyramid_factor: int
+        by how much the resolution decreases from one level of the pyramid to the next. defaults to 10
+    pyramid_bins: int
+        how many bins each level of the pyramid keeps, independent of duration_in_ms. Level k covers pyramid_factor**(k+1) * pyramid_bins samples. defaults to 2000
+    filename: Union[None, str, Path]
+        store the data in this memory-mapped file and the timestamps in the same file with the suffix .tstamps appended, instead of RAM, e.g. for histories of an hour. defaults to None, i.e. RAM
+    track_stats: bool
+        whether to keep running per-channel statistics of the data in the ringbuffer, see :meth:`~.stats`. defaults to False
+    filters: Union[None, Filter, List[Filter]]
+        causal filters from :mod:`liesl.buffers.filters` applied to every chunk before it is stored, keeping their state from chunk to chunk. Consider a float dtype for integer streams. defaults to None, i.e. the raw data is stored
+    channels: Union[None, List[Union[int, str]]]
+        store only these channels, given by their indices or their labels in the description of the stream. defaults to None, i.e. all channels
+    fill_gaps: bool
+        whether to fill samples missing from a stream with a regular sampling rate, e.g. after dropped packets, with NaN. The timestamps are then stored on a grid of 1/fs, which only slowly follows the drift of the clock of the stream, so that :meth:`~.index_at` and :meth:`~.get_window` find a timestamp in constant time, and :meth:`~.get_gaps` logs the gaps. Gaps shorter than the jitter of the timestamps, and at least :data:`GAP_TOLERANCE`, are not detected. Requires a float dtype. defaults to False
+    history_in_ms: float
+        how long to keep the samples of an integer stream after they left the ringbuffer, delta-encoded and compressed in a :class:`~liesl.buffers.history.CompressedHistory`, see :meth:`~.get_history`. defaults to 0, i.e. no history
+    shared_name: Union[None, str]
+        store the data and the timestamps in blocks of shared memory with this name and the suffix .tstamps appended, so that other processes can read them with an :class:`~liesl.buffers.shared.AttachedRingBuffer`. The blocks are released when this process exits. defaults to None, i.e. private memory
     
 
     Example::
@@ -115,85 +1176,392 @@ class RingBuffer(threading.Thread):
         streaminfo: StreamInfo,
         duration_in_ms: float = 1000,
         verbose: bool = False,
+        dtype: Union[None, str, np.dtype] = None,
+        max_chunklen: int = 1024,
+        pyramid_levels: int = 0,
+        pyramid_factor: int = 10,
+        pyramid_bins: int = 2000,
+        filename: Union[None, str, Path] = None,
+        track_stats: bool = False,
+        filters: Union[None, Filter, List[Filter]] = None,
+        channels: Union[None, List[Union[int, str]]] = None,
+        fill_gaps: bool = False,
+        history_in_ms: float = 0,
+        shared_name: Union[None, str] = None,
     ) -> None:
 
         threading.Thread.__init__(self)
         self.streaminfo = streaminfo
-        fs = streaminfo.nominal_srate()
-        if fs == 0:  # pragma no cover
-            self.fs = 1000
-            print(
-                "Irregular sampling rate. Assuming fs=1000 and "
-                + "convert duration_in_ms into duration_in_samples"
+        self.max_chunklen = int(max_chunklen)
+        self.fs = streaminfo.nominal_srate()
+        self.duration_in_ms = duration_in_ms
+        if channels is None:
+            self.channels = None
+            max_column = int(streaminfo.channel_count())
+        else:
+            self.channels = self._resolve_channels(channels)
+            max_column = len(self.channels)
+        if dtype is None:
+            dtype = channel_format_to_dtype(streaminfo.channel_format())
+        if self.fs == 0 and filename is not None:
+            raise ValueError("Files require a regular sampling rate")
+        if self.fs == 0 and shared_name is not None:
+            raise ValueError("Shared memory requires a regular sampling rate")
+        if filename is not None and shared_name is not None:
+            raise ValueError("Data can not be stored in a file and shared memory")
+        self.shared_name = shared_name
+        if self.fs == 0:  # keep duration_in_ms of history, measured by tstamps
+            self.buffer = GrowingRingBuffer(
+                columnlen=max_column, verbose=verbose, dtype=dtype
+            )
+            self.tstamps = GrowingRingBuffer(
+                columnlen=1, verbose=verbose, dtype=np.float64
+            )
+        elif filename is not None:
+            max_row = int(duration_in_ms * (self.fs / 1000))
+            slack = READ_SLACK * self.max_chunklen
+            self.buffer = MemmapRingBuffer(
+                filename, max_row, max_column, verbose=verbose, dtype=dtype, slack=slack
+            )
+            self.tstamps = MemmapRingBuffer(
+                str(filename) + ".tstamps",
+                max_row,
+                1,
+                verbose=verbose,
+                dtype=np.float64,
+                slack=slack,
+            )
+        elif shared_name is not None:
+            max_row = int(duration_in_ms * (self.fs / 1000))
+            slack = READ_SLACK * self.max_chunklen
+            self.buffer = SharedRingBuffer(
+                shared_name,
+                max_row,
+                max_column,
+                verbose=verbose,
+                dtype=dtype,
+                slack=slack,
+            )
+            self.tstamps = SharedRingBuffer(
+                shared_name + ".tstamps",
+                max_row,
+                1,
+                verbose=verbose,
+                dtype=np.float64,
+                slack=slack,
             )
         else:
-            self.fs = fs
-        max_row = int(duration_in_ms * (self.fs / 1000))
-        max_column = int(streaminfo.channel_count())
-        self.buffer = SimpleRingBuffer(
-            rowlen=max_row, columnlen=max_column, verbose=verbose
-        )
-        self.tstamps = SimpleRingBuffer(rowlen=max_row, columnlen=1, verbose=verbose)
+            max_row = int(duration_in_ms * (self.fs / 1000))
+            slack = READ_SLACK * self.max_chunklen
+            self.buffer = SimpleRingBuffer(
+                max_row, max_column, verbose=verbose, dtype=dtype, slack=slack
+            )
+            self.tstamps = SimpleRingBuffer(
+                max_row, 1, verbose=verbose, dtype=np.float64, slack=slack
+            )
+        if pyramid_levels:
+            if self.buffer.dtype == object:
+                raise ValueError("A pyramid requires a numeric stream")
+            from liesl.buffers.pyramid import DecimationPyramid
+
+            self.pyramid = DecimationPyramid(
+                columnlen=max_column,
+                levels=pyramid_levels,
+                factor=pyramid_factor,
+                max_bins=pyramid_bins,
+            )
+        else:
+            self.pyramid = None
+        if filters is not None:
+            if self.buffer.dtype == object:
+                raise ValueError("Filters require a numeric stream")
+            if isinstance(filters, (list, tuple)):
+                filters = FilterChain(filters)
+        self.filters = filters
+        if fill_gaps:
+            if self.fs == 0:
+                raise ValueError("Filling gaps requires a regular sampling rate")
+            if not np.issubdtype(self.buffer.dtype, np.floating):
+                raise ValueError("Filling gaps requires a float dtype")
+        self.fill_gaps = fill_gaps
+        self._gaps: deque = deque(maxlen=1000)
+        self._grid: Union[None, Tuple[float, int]] = None
+        self._jitter = 0.0  # in samples, the largest recent deviation from the grid
+        if history_in_ms:
+            self.history = CompressedHistory(
+                max_column, self.buffer.dtype, history_in_ms
+            )
+        else:
+            self.history = None
+        if track_stats:
+            if self.buffer.dtype == object:
+                raise ValueError("Statistics require a numeric stream")
+            from liesl.buffers.stats import RunningStats
+
+            self._stats = RunningStats(self.buffer)
+        else:
+            self._stats = None
+        self.metrics = BufferMetrics()
+        self._subscribers: List[Tuple[Subscriber, Subscriber]] = []
         self.bufferlock = threading.Lock()
+        self._new_samples = threading.Condition(self.bufferlock)
+        self._seqlock = SeqLock(
+            self.bufferlock,
+            counter=None if shared_name is None else self.buffer.sequence,
+        )
+        self._newest_tstamp = -np.inf
         self._is_running = threading.Event()
+        self.offset = 0.0
+        self.info: Union[None, dict] = None
+
+    def _resolve_channels(self, channels: List[Union[int, str]]) -> ndarray:
+        "convert channel labels and indices into indices"
+        chanmap = {}
+        if any(isinstance(c, str) for c in channels):
+            # the labels are only in the full description, which is requested
+            # without subscribing to the samples
+            inlet = StreamInlet(self.streaminfo)
+            try:
+                info = inlet.info(timeout=INFO_TIMEOUT)
+            except RuntimeError:  # pylsl raises a TimeoutError or LostError
+                raise ConnectionError("Stream did not send its description")
+            finally:
+                inlet.close_stream()
+            try:
+                desc = streaminfoxml_to_dict(info.as_xml())["desc"]
+                for chan in desc["channels"]["channel"]:
+                    chanmap[chan["label"]] = chan["idx"]
+            except (KeyError, TypeError):  # the stream has no channel labels
+                pass
+        indices = []
+        for c in channels:
+            if isinstance(c, str):
+                if c not in chanmap:
+                    raise ValueError("Stream has no channel labeled " + c)
+                c = chanmap[c]
+            if not 0 <= c < self.streaminfo.channel_count():
+                raise ValueError("Stream has no channel #" + str(c))
+            indices.append(int(c))
+        return np.array(indices, dtype=int)
 
     def reset(self):
         "clear the internal buffer and start collecting fresh"
-        self.bufferlock.acquire()
-        self.buffer.reset()
-        self.bufferlock.release()
+        with self.bufferlock, self._seqlock.write():
+            self.buffer.reset()
+            self.tstamps.reset()
+            if self.pyramid is not None:
+                self.pyramid.reset()
+            if self._stats is not None:
+                self._stats.reset()
+            self._gaps.clear()
+            self._grid = None
+            self._jitter = 0.0
+            if self.history is not None:
+                self.history.reset()
 
-    def get_data(self) -> ndarray:
-        """get only the current data without timestamps
+    def get_history(self, t_start: float, t_end: float) -> Tuple[ndarray, ndarray]:
+        """get the data and timestamps between two timestamps, reaching back into the compressed history
+
+        Requires history_in_ms. The compressed blocks are only selected
+        while reading from the buffer, and decompressed afterwards.
+
+        args
+        ----
+        t_start: float
+            the earliest timestamp to return, in the local clock
+        t_end: float
+            the latest timestamp to return, in the local clock
 
         returns
         -------
         chunk: ndarray
-            the data (usually in samples x channels)
-        
-        
+            the data within the window (usually in samples x channels)
+        tstamps: ndarray
+            the timestamps for each sample within the window
         """
-        with self.bufferlock:
-            buffer = self.buffer.get()
-        return buffer
+        if self.history is None:
+            raise ValueError("RingBuffer was created without history_in_ms")
+        t_start = t_start - self.offset - TOLERANCE
+        t_end = t_end - self.offset + TOLERANCE
+
+        def read(buffer, tstamps):
+            start = tstamps.searchsorted(t_start, side="left")
+            stop = tstamps.searchsorted(t_end, side="right")
+            first = buffer.count - buffer.shape[0] + start
+            chunk = buffer.get_range(start, stop)
+            return (chunk, tstamps.get_range(start, stop)), first
+
+        buffer, tstamps = self._read(read)
+        # the samples before the copied ones have been moved into the history
+        # by now
+        t_older = tstamps[0, 0] - TOLERANCE if len(tstamps) else t_end
+        blocks = self._seqlock.read(lambda: self.history.select(t_start, t_older))
+        older, older_tstamps = self.history.read(blocks, t_start, t_older)
+        buffer = np.concatenate((older, buffer))
+        tstamps = np.concatenate((older_tstamps, tstamps))
+        tstamps += self.offset
+        return buffer, tstamps
+
+    def _index_at(self, tstamps: SimpleRingBuffer, tstamp: float) -> int:
+        "the index of a timestamp in the clock of the stream, requires fill_gaps"
+        length = tstamps.shape[0]
+        if not length:
+            return 0
+        # the grid drifts by far less than a sample between nearby samples, so
+        # the estimate from the oldest sample is corrected from the one it hits
+        index = row = 0
+        for attempt in range(3):
+            nearby = tstamps.get_range(row, row + 1)[0, 0]
+            index = row + int(np.rint((tstamp - nearby) * self.fs))
+            if min(max(0, index), length - 1) == row:
+                break
+            row = min(max(0, index), length - 1)
+        return index
+
+    def index_at(self, tstamp: float) -> int:
+        """the index of the sample closest to a timestamp
+
+        Requires fill_gaps, which ensures that the sample with index i was
+        taken about i/fs after the oldest sample in the ringbuffer. Only the
+        drift of the grid since the oldest sample is corrected from the
+        timestamp of that sample, so no timestamps have to be searched.
+
+        args
+        ----
+        tstamp: float
+            the timestamp in the local clock, i.e. corrected like the timestamps returned by :meth:`~.get`
 
-    def get(self) -> Tuple[ndarray, ndarray]:
-        """get the current data with timestamps
-        
         returns
         -------
-        chunk: ndarray
-            the data (usually in samples x channels)
+        index: int
+            the row of the sample in the data returned by :meth:`~.get`. It is negative or beyond the last row if the timestamp is not within the ringbuffer
+        """
+        if not self.fill_gaps:
+            raise ValueError("RingBuffer was created without fill_gaps")
+        return self._seqlock.read(
+            lambda: self._index_at(self.tstamps, tstamp - self.offset)
+        )
+
+    def get_gaps(self) -> List[Tuple[float, int]]:
+        """the most recent gaps which were filled with NaN
+
+        Requires fill_gaps. At most 1000 gaps are logged.
+
+        returns
+        -------
+        gaps: List[Tuple[float, int]]
+            the timestamp of the first missing sample in the local clock and the number of missing samples of each gap
+        """
+        if not self.fill_gaps:
+            raise ValueError("RingBuffer was created without fill_gaps")
+        gaps = self._seqlock.read(lambda: list(self._gaps))
+        return [(tstamp + self.offset, n) for tstamp, n in gaps]
+
+    def stats(self) -> Dict[str, ndarray]:
+        """the running statistics of each channel in the ringbuffer
+
+        Requires track_stats. The statistics are updated with every chunk,
+        so requesting them does not reduce the whole window again.
+
+        returns
+        -------
+        stats: Dict[str, ndarray]
+            the count, mean, var, rms, min and max of each channel
+        """
+        if self._stats is None:
+            raise ValueError("RingBuffer was created without track_stats")
+        return self._seqlock.read(self._stats.get)
+
+    def get_decimated(
+        self, t_start: float, t_end: float, npoints: int = 1000
+    ) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        """get min, max and mean of a long time span at a fixed resolution
+
+        Requires a pyramid, see pyramid_levels. The time span can reach back
+        far beyond duration_in_ms, depending on the number of levels.
+
+        args
+        ----
+        t_start: float
+            the earliest timestamp to return, in the local clock
+        t_end: float
+            the latest timestamp to return, in the local clock
+        npoints: int
+            how many bins to return at most
+
+        returns
+        -------
+        mins: ndarray
+            the minimum of each bin (bins x channels)
+        maxs: ndarray
+            the maximum of each bin (bins x channels)
+        means: ndarray
+            the mean of each bin (bins x channels)
         tstamps: ndarray
-            the timestamps for each sample       
-        
+            the timestamp of the first sample in each bin (bins x 1)
         """
-        with self.bufferlock:
-            buffer = self.buffer.get()
-            tstamps = self.tstamps.get()
+        if self.pyramid is None:
+            raise ValueError("RingBuffer was created without pyramid_levels")
+        mins, maxs, means, tstamps = self._seqlock.read(
+            lambda: self.pyramid.get(
+                t_start - self.offset, t_end - self.offset, npoints
+            )
+        )
         tstamps += self.offset
-        return buffer, tstamps
+        return mins, maxs, means, tstamps
 
-    @property
-    def shape(self) -> Tuple[int, int]:
-        "the current size of the data currently in the ringbuffer"
-        return self.buffer.shape
+    def _dump(self, path: Union[str, Path]) -> Dump:
+        "take a snapshot to be written by _write_dumps"
+        chunk, tstamps = self.snapshot()
+        info = self.info
+        if info is None:  # not connected yet
+            info = streaminfoxml_to_dict(self.streaminfo.as_xml())
+        return path, chunk, tstamps, info
 
-    @property
-    def max_shape(self) -> Tuple[int, int]:
-        "the maximal size of the ringbuffer"
-        return self.buffer.max_shape
+    def dump(self, path: Union[str, Path]) -> threading.Thread:
+        """write the current data with timestamps to disk without blocking
 
-    @property
-    def is_full(self) -> bool:
-        "whether the ringbuffer is full"
-        return self.buffer.shape[0] == self.buffer.max_shape[0]
+        Only the snapshot is taken before returning. The data,
+        timestamps and stream information are written as .npz file from a
+        background thread, so neither the caller nor the acquisition waits
+        for the disk.
+
+        args
+        ----
+        path: Union[str, Path]
+            the file to write, .npz is appended if missing
+
+        returns
+        -------
+        thread: threading.Thread
+            the thread writing the file, join it to wait until the file is complete
+
+
+        Example::
+
+            rb.dump("crash.npz").join()
+            chunk, tstamps, info = load_dump("crash.npz")
+        """
+        thread = threading.Thread(target=_write_dumps, args=([self._dump(path)],))
+        thread.start()
+        return thread
 
     def stop(self):
         "stop the subscription to the outlet"
         self.is_running = False
         self.join()
 
+    def close(self):
+        """stop the buffer and release its shared memory
+
+        Only required for a buffer with a shared_name. Afterwards, the
+        buffer can not be read anymore.
+        """
+        if self.is_alive():
+            self.stop()
+        if self.shared_name is not None:
+            self._close_shared()
+
     @property
     def is_running(self):
         "whether the ringbuffer is receiving new data or not"
@@ -218,19 +1586,281 @@ class RingBuffer(threading.Thread):
             print(".", end="")
         print("]")
 
+    def _connect(self) -> StreamInlet:
+        "open the inlet and prepare the destination for pulled chunks"
+        stream = StreamInlet(self.streaminfo)
+        self.info = inlet_to_dict(stream)
+        self.offset = stream.time_correction()
+        if self.shared_name is not None:
+            self.buffer.offset = self.offset
+        dtype = channel_format_to_dtype(self.streaminfo.channel_format())
+        if dtype == object:  # liblsl can not pull strings into a buffer
+            self._destination = None
+        else:
+            self._destination = np.empty(
+                (self.max_chunklen, self.streaminfo.channel_count()), dtype=dtype
+            )
+        return stream
+
+    def _pull(self, stream: StreamInlet, timeout: float = 0.0) -> int:
+        """pull a single chunk from the inlet into the ringbuffer
+
+        Blocks for at most timeout seconds until the first sample arrives,
+        and then takes whatever else is immediately available.
+
+        returns
+        -------
+        count: int
+            how many samples were pulled
+        """
+        destination = self._destination
+        chunk, tstamp = stream.pull_chunk(
+            timeout=timeout,
+            max_samples=1,
+            dest_obj=None if destination is None else destination[:1],
+        )
+        if not len(tstamp):
+            self.metrics.idle_pulls += 1
+            return 0
+        started = time.perf_counter()
+        if self.max_chunklen > 1:
+            rest, rest_tstamp = stream.pull_chunk(
+                max_samples=self.max_chunklen - 1,
+                dest_obj=None if destination is None else destination[1:],
+            )
+            tstamp = list(tstamp) + list(rest_tstamp)
+            if destination is None:
+                chunk = list(chunk) + list(rest)
+        count = len(tstamp)
+        if destination is not None:
+            chunk = destination[:count]
+        if self.channels is not None:
+            chunk = np.asarray(chunk, dtype=self.buffer.dtype)[:, self.channels]
+        self.metrics.pull_us.add((time.perf_counter() - started) * 1e6)
+        self.metrics.add_chunk(count, full=count == self.max_chunklen)
+        self._put(chunk, tstamp)
+        return count
+
+    def _fill_gaps(
+        self, chunk: Union[list, ndarray], tstamp: Union[list, ndarray]
+    ) -> Tuple[ndarray, ndarray, List[Tuple[float, int]]]:
+        """insert NaN samples wherever samples are missing and align the timestamps to a grid
+
+        Each sample is placed on a grid of 1/fs continuing after the previous
+        sample. A sample is missing if a timestamp is later than its place on
+        the grid by more than a tolerance, so that the jitter of the
+        timestamps does not cause gaps. The tolerance is the largest of 1.5
+        samples, GAP_TOLERANCE and GAP_JITTER times the observed jitter, i.e.
+        the largest recent deviation from the grid, forgotten over about 10 s.
+        Gaps within the tolerance, or during the first GAP_WARMUP after the
+        start, are not detected. The timestamps are replaced by their places
+        on the grid, which then follows the remaining deviation, averaged over
+        about 0.1 s, to keep up with the drift of the clock of the stream. At
+        most max_row samples are inserted per gap, the most recent ones.
+
+        returns
+        -------
+        chunk: ndarray
+            the chunk with the inserted samples
+        tstamps: ndarray
+            the timestamps on the grid, including the ones of the inserted samples
+        gaps: List[Tuple[float, int]]
+            the timestamp of the first missing sample and the number of missing samples of each gap
+        """
+        tstamp = np.asarray(tstamp, dtype=np.float64)
+        t0, k = (tstamp[0], 0) if self._grid is None else self._grid
+        # how many samples each timestamp is later than the grid
+        late = (tstamp - t0) * self.fs - (k + np.arange(len(tstamp)))
+        tolerance = max(1.5, GAP_TOLERANCE * self.fs, GAP_JITTER * self._jitter)
+        if late[0] < -tolerance:  # the clock of the stream jumped back
+            t0, late = t0 + late[0] / self.fs, late - late[0]
+        if k < GAP_WARMUP * self.fs:  # the jitter is not known yet
+            tolerance = np.inf
+        missing = np.where(late > tolerance, np.round(late), 0)
+        missing = np.maximum.accumulate(missing).astype(int)
+        places = k + np.arange(len(tstamp)) + missing
+        grid = t0 + places / self.fs
+        # average the deviation over about 0.1 s to smooth the jitter
+        weight = min(1.0, len(tstamp) / (0.1 * self.fs))
+        drift = np.mean(late - missing) / self.fs
+        self._grid = (t0 + weight * drift, int(places[-1]) + 1)
+        # keep the largest deviation, forgetting it over about 10 s
+        deviation = np.abs(late - missing).max()
+        decayed = self._jitter + min(1.0, weight / 100) * (deviation - self._jitter)
+        self._jitter = max(deviation, decayed)
+        gaps = np.flatnonzero(np.diff(missing, prepend=0))
+        if not len(gaps):
+            return chunk, grid, []
+        chunk = np.array(chunk, dtype=self.buffer.dtype, ndmin=2)
+        chunks, tstamps, log = [], [], []
+        last = 0
+        for idx in gaps:
+            n = int(missing[idx] - (missing[idx - 1] if idx else 0))
+            log.append((grid[idx] - n / self.fs, n))
+            filled = min(n, self.buffer.max_row)
+            chunks += [chunk[last:idx], np.full((filled, chunk.shape[1]), np.nan)]
+            tstamps += [
+                grid[last:idx],
+                t0 + (places[idx] - np.arange(filled, 0, -1)) / self.fs,
+            ]
+            last = idx
+        chunks.append(chunk[last:])
+        tstamps.append(grid[last:])
+        return np.concatenate(chunks), np.concatenate(tstamps), log
+
+    def _put(self, chunk: Union[list, ndarray], tstamp: Union[list, ndarray]):
+        "store a pulled chunk and its timestamps and notify waiting consumers"
+        if self.filters is not None:
+            chunk = self.filters.process(chunk)
+        if self.fill_gaps:
+            chunk, tstamp, gaps = self._fill_gaps(chunk, tstamp)
+        waiting = time.perf_counter()
+        with self.bufferlock, self._seqlock.write():
+            locked = time.perf_counter()
+            if self.fs != 0 and len(chunk) > self.buffer.max_row:
+                self.metrics.overflows += 1
+            keep_evicted = self._stats is not None or self.history is not None
+            if keep_evicted and self.fs != 0:
+                # the oldest samples will be overwritten by the put
+                overwritten = min(len(chunk), self.buffer.max_row)
+                overwritten += self.buffer.shape[0] - self.buffer.max_row
+                evicted = self.buffer.get_range(0, max(0, overwritten))
+                evicted_tstamps = self.tstamps.get_range(0, max(0, overwritten))
+            self.buffer.put(chunk)
+            self.tstamps.put(tstamp, transpose=True)
+            self._newest_tstamp = tstamp[-1]
+            if self.fill_gaps:
+                self._gaps.extend(gaps)
+            if self._stats is not None:
+                length = self.buffer.shape[0]
+                stored = min(len(chunk), length)
+                self._stats.add(self.buffer.get_range(length - stored, length))
+            if self.fs == 0:
+                stale = self.tstamps.searchsorted(
+                    tstamp[-1] - self.duration_in_ms / 1000, side="left"
+                )
+                if keep_evicted:
+                    evicted = self.buffer.get_range(0, stale)
+                    evicted_tstamps = self.tstamps.get_range(0, stale)
+                self.buffer.discard(stale)
+                self.tstamps.discard(stale)
+            if self._stats is not None:
+                self._stats.remove(evicted)
+            if self.history is not None:
+                self.history.put(evicted, evicted_tstamps)
+            if self.pyramid is not None:
+                self.pyramid.put(chunk, tstamp)
+            self._new_samples.notify_all()
+        released = time.perf_counter()
+        self.metrics.lock_wait_us.add((locked - waiting) * 1e6)
+        self.metrics.put_us.add((released - locked) * 1e6)
+        self.metrics.age_us.add((local_clock() - tstamp[-1] - self.offset) * 1e6)
+        if self._subscribers:
+            chunk = np.array(chunk, dtype=self.buffer.dtype, ndmin=2)
+            tstamps = np.asarray(tstamp, dtype=np.float64)[:, None] + self.offset
+            for callback, handler in self._subscribers:
+                try:
+                    handler(chunk, tstamps)
+                except Exception:  # a subscriber must not stop the acquisition
+                    traceback.print_exc()
+
+    def subscribe(self, callback: Subscriber, worker: bool = False):
+        """call a function with every new chunk as soon as it was stored
+
+        The callback receives a copy of the chunk as stored in the
+        ringbuffer, i.e. after filtering, and its timestamps in the local
+        clock. Exceptions raised by the callback are printed and ignored.
+
+        args
+        ----
+        callback: Subscriber
+            called with chunk (samples x channels) and tstamps (samples x 1)
+        worker: bool
+            whether to call it from its own :class:`~.SubscriberThread`. Otherwise, it is called from the acquisition thread and should return quickly. defaults to False
+
+
+        Example::
+
+            def detect(chunk, tstamps):
+                if chunk[:, 0].max() > 100:
+                    print("Trigger at", tstamps[chunk[:, 0].argmax(), 0])
+
+            rb.subscribe(detect)
+        """
+        handler = SubscriberThread(callback) if worker else callback
+        self._subscribers = self._subscribers + [(callback, handler)]
+
+    def unsubscribe(self, callback: Subscriber):
+        """stop calling a function with new chunks
+
+        args
+        ----
+        callback: Subscriber
+            the function as passed to :meth:`~.subscribe`
+        """
+        removed = [s for s in self._subscribers if s[0] == callback]
+        self._subscribers = [s for s in self._subscribers if s[0] != callback]
+        for callback, handler in removed:
+            if isinstance(handler, SubscriberThread):
+                handler.stop()
+
+    def wait_for_samples(
+        self, n: int, timeout: float = None, since: int = None
+    ) -> bool:
+        """block until new samples arrived in the ringbuffer
+
+        args
+        ----
+        n: int
+            how many new samples to wait for
+        timeout: float
+            the maximal time to wait in seconds. defaults to None, i.e. forever
+        since: int
+            the cursor the samples have to be newer than, e.g. as returned by :meth:`~.get_since`. defaults to None, i.e. the current :attr:`~.cursor`
+
+        returns
+        -------
+        arrived: bool
+            whether the samples arrived before the timeout expired
+
+
+        Example::
+
+            cursor = rb.cursor
+            while rb.wait_for_samples(50, timeout=1, since=cursor):
+                chunk, tstamps, cursor = rb.get_since(cursor)
+        """
+        with self._new_samples:
+            target = (self.buffer.count if since is None else since) + n
+            return self._new_samples.wait_for(
+                lambda: self.buffer.count >= target, timeout
+            )
+
+    def wait_until(self, timestamp: float, timeout: float = None) -> bool:
+        """block until a sample with at least this timestamp arrived
+
+        args
+        ----
+        timestamp: float
+            the timestamp in the local clock, i.e. corrected like the timestamps returned by :meth:`~.get`
+        timeout: float
+            the maximal time to wait in seconds. defaults to None, i.e. forever
+
+        returns
+        -------
+        arrived: bool
+            whether the sample arrived before the timeout expired
+        """
+        with self._new_samples:
+            return self._new_samples.wait_for(
+                lambda: self._newest_tstamp + self.offset >= timestamp, timeout
+            )
+
     def run(self):
         """"""
-        stream = StreamInlet(
-            self.streaminfo
+        stream = (
+            self._connect()
         )  # create the inlet locally so it can be properly garbage collected
-        self.info = inlet_to_dict(stream)
-        self.offset = stream.time_correction()
         self.is_running = True
         while self.is_running:
-            chunk, tstamp = stream.pull_chunk()
-            if chunk:
-                with self.bufferlock:  # to prevent writing while reading
-                    self.buffer.put(chunk)
-                    self.tstamps.put(tstamp, transpose=True)
-            else:
-                time.sleep(0.001)  # can prevent hiccups when run in a repl
+            self._pull(stream, timeout=0.1)
@@ -0,0 +1,60 @@
+"""
+Shared Memory
+-------------
+"""
+from liesl.buffers.ringbuffer import RingBufferReader, SharedRingBuffer, SeqLock
+
+READ_TIMEOUT = 1.0  #: in s, how long to wait for the acquisition to finish a write
+
+
+class AttachedRingBuffer(RingBufferReader):
+    """read a :class:`~liesl.buffers.ringbuffer.RingBuffer` running in another process
+
+    The ringbuffer has to be created with a shared_name. Its data and
+    timestamps are read directly from shared memory, and the sequence
+    counter shared with the acquisition ensures that every copy is
+    consistent, see :class:`~liesl.buffers.ringbuffer.SeqLock`. With
+    :meth:`~.views`, windows can be processed without any copy. If the
+    acquisition does not finish a write within :data:`READ_TIMEOUT`, e.g.
+    because it crashed, reading raises a TimeoutError. All reading
+    methods of the ringbuffer are available, but the attached ringbuffer does not
+    receive its own subscriptions, statistics, history or pyramid.
+
+    args
+    ----
+    name: str
+        the shared_name of the ringbuffer
+
+
+    Example::
+
+        # in the acquisition process
+        rb = RingBuffer(sinfo, duration_in_ms=1000, shared_name="eeg")
+        rb.await_running()
+
+        # in any worker process
+        arb = AttachedRingBuffer("eeg")
+        chunks, tstamps, first = arb.views(last=500)
+
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.buffer = SharedRingBuffer.attach(name)
+        self.tstamps = SharedRingBuffer.attach(name + ".tstamps")
+        self._seqlock = SeqLock(
+            None, timeout=READ_TIMEOUT, counter=self.buffer.sequence
+        )
+
+    @property
+    def offset(self) -> float:
+        "the clock offset of the stream as measured by the acquisition"
+        return self.buffer.offset
+
+    def close(self):
+        """detach from the shared memory
+
+        All views returned by :meth:`~.views` have to be deleted before,
+        otherwise a BufferError is raised.
+        """
+        self._close_shared()
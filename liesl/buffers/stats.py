@@ -0,0 +1,148 @@
+"""
+RunningStats
+------------
+"""
+from liesl.buffers.ringbuffer import SimpleRingBuffer
+from collections import deque
+from typing import Dict
+import numpy as np
+from numpy import ndarray
+
+
+class RunningStats:
+    """per-channel statistics over the samples currently in a ringbuffer
+
+    Instead of reducing the whole window again on every request, the sums
+    are updated in O(len(chunk)) whenever samples enter or leave the buffer.
+    Minimum and maximum are kept per block of blocklen samples, so that only
+    the oldest, partially evicted block has to be reduced again. To prevent
+    rounding errors from accumulating, the sums are recomputed from the buffer
+    once as many samples as it holds have passed through.
+
+    args
+    ----
+    buffer: SimpleRingBuffer
+        the buffer whose samples are summarized. It has to be updated before
+        :meth:`~.add` and :meth:`~.remove` are called, and new samples have
+        to be added before evicted samples are removed
+    blocklen: int
+        how many samples share one minimum and maximum
+
+
+    Example::
+
+        ring = SimpleRingBuffer(1000, 8)
+        stats = RunningStats(ring)
+        ring.put(chunk)
+        stats.add(chunk)
+        stats.get()["mean"]
+
+    """
+
+    def __init__(self, buffer: SimpleRingBuffer, blocklen: int = 128) -> None:
+        self.buffer = buffer
+        self.blocklen = int(blocklen)
+        self.reset()
+
+    def reset(self):
+        "forget all samples"
+        columnlen = self.buffer.max_column
+        self.count = 0
+        self._sum = np.zeros(columnlen)
+        self._sumsq = np.zeros(columnlen)
+        self._blocks = deque()  # [count, min, max] from oldest to newest
+        self._passed = 0  # samples added since the sums were recomputed
+
+    def add(self, chunk: ndarray):
+        """account for samples which entered the buffer
+
+        args
+        ----
+        chunk: ndarray
+            the new samples (samples x channels)
+        """
+        chunk = np.asarray(chunk, dtype=np.float64)
+        chunk = chunk.reshape(-1, self.buffer.max_column)
+        self.count += len(chunk)
+        self._sum += chunk.sum(axis=0)
+        self._sumsq += np.square(chunk).sum(axis=0)
+        self._passed += len(chunk)
+
+        if self._blocks and self._blocks[-1][0] < self.blocklen:
+            block = self._blocks[-1]
+            head = chunk[: self.blocklen - block[0]]
+            block[0] += len(head)
+            block[1] = np.minimum(block[1], head.min(axis=0))
+            block[2] = np.maximum(block[2], head.max(axis=0))
+            chunk = chunk[len(head) :]
+        full = (len(chunk) // self.blocklen) * self.blocklen
+        if full:
+            blocks = chunk[:full].reshape(-1, self.blocklen, chunk.shape[1])
+            for mi, ma in zip(blocks.min(axis=1), blocks.max(axis=1)):
+                self._blocks.append([self.blocklen, mi, ma])
+        if full < len(chunk):
+            rest = chunk[full:]
+            self._blocks.append([len(rest), rest.min(axis=0), rest.max(axis=0)])
+
+    def remove(self, chunk: ndarray):
+        """account for the oldest samples which left the buffer
+
+        args
+        ----
+        chunk: ndarray
+            the samples which were evicted (samples x channels)
+        """
+        chunk = np.asarray(chunk, dtype=np.float64)
+        chunk = chunk.reshape(-1, self.buffer.max_column)
+        if not len(chunk):
+            return
+        self.count -= len(chunk)
+        if self._passed >= self.buffer.shape[0]:
+            self._recompute()
+        else:
+            self._sum -= chunk.sum(axis=0)
+            self._sumsq -= np.square(chunk).sum(axis=0)
+
+        removed = len(chunk)
+        while self._blocks and self._blocks[0][0] <= removed:
+            removed -= self._blocks.popleft()[0]
+        if removed and self._blocks:
+            block = self._blocks[0]
+            block[0] -= removed
+            head = self.buffer.get_range(0, block[0])
+            block[1] = head.min(axis=0)
+            block[2] = head.max(axis=0)
+
+    def _recompute(self):
+        "recompute the sums from the samples in the buffer"
+        data = self.buffer.get().astype(np.float64)
+        self.count = len(data)
+        self._sum = data.sum(axis=0)
+        self._sumsq = np.square(data).sum(axis=0)
+        self._passed = 0
+
+    def get(self) -> Dict[str, ndarray]:
+        """the statistics of each channel
+
+        returns
+        -------
+        stats: Dict[str, ndarray]
+            the count, mean, var, rms, min and max of each channel
+        """
+        count = max(self.count, 1)
+        mean = self._sum / count
+        meansq = self._sumsq / count
+        if self._blocks:
+            mins = np.min([block[1] for block in self._blocks], axis=0)
+            maxs = np.max([block[2] for block in self._blocks], axis=0)
+        else:
+            mins = np.full(self.buffer.max_column, np.nan)
+            maxs = np.full(self.buffer.max_column, np.nan)
+        return {
+            "count": self.count,
+            "mean": mean,
+            "var": np.maximum(meansq - np.square(mean), 0),
+            "rms": np.sqrt(meansq),
+            "min": mins,
+            "max": maxs,
+        }
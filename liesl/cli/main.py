@@ -86,6 +86,27 @@ def get_parser():
         "--type", help="type of the stream", default="EEG"
     )
 
+    # daemon ------------------------------------------------------------------
+    helpstr = """buffer LSL streams in shared memory for local processes"""
+    parser_daemon = subparsers.add_parser("daemon", help=helpstr)
+    parser_daemon.add_argument(
+        "--streams",
+        help="""which streams to buffer. For example:
+                    liesl daemon --streams '[{"name": "Liesl-Mock-EEG"}]'""",
+        default="[{'type': 'EEG'}]",
+        type=literal_eval,
+    )
+    parser_daemon.add_argument(
+        "--duration",
+        type=float,
+        default=10_000,
+        help="the length of each buffer in ms",
+    )
+    parser_daemon.add_argument(
+        "--address",
+        help="the path of the Unix socket. defaults to liesl-daemon.sock in the temporary directory",
+    )
+
     # xdf ---------------------------------------------------------------------
     helpstr = """inspect an XDF file"""
     parser_xdf = subparsers.add_parser("xdf", help=helpstr)
@@ -186,6 +207,24 @@ def mock(args):
     m.start()
 
 
+def daemon(args):
+    "execute subcommand daemon"
+    from liesl.buffers.daemon import Daemon
+
+    d = Daemon(args.streams, duration_in_ms=args.duration, address=args.address)
+    try:
+        d.await_running()
+    except Exception:
+        d.stop()
+        raise
+    print("Serving", [s["name"] for s in d.streams], "at", d.address)
+    try:
+        while d.is_alive():
+            d.join(1)
+    except KeyboardInterrupt:
+        d.stop()
+
+
 def do_list(args):
     "execute subcommand list"
     if args.desc:
@@ -213,6 +252,8 @@ def start(args, unknown):
         return mock(args)
     if args.subcommand == "list":
         return do_list(args)
+    if args.subcommand == "daemon":
+        return daemon(args)
 
 
 def main():
@@ -6,10 +6,23 @@ Convert streams
 from liesl.streams._xmltodict import parse as xml_to_dict
 from typing import Dict, Type
 from pylsl import StreamInlet
+import numpy as np
 
 ChannelIndexMap = Dict[
     str, int
 ]  #: A Mapping from channel-names to channel-indices
+
+ChannelFormatMap = Dict[int, np.dtype]  #: A Mapping from LSL formats to dtypes
+channel_format_dtypes: ChannelFormatMap = {
+    1: np.dtype("float32"),  # cf_float32
+    2: np.dtype("float64"),  # cf_double64
+    3: np.dtype("object"),  # cf_string
+    4: np.dtype("int32"),  # cf_int32
+    5: np.dtype("int16"),  # cf_int16
+    6: np.dtype("int8"),  # cf_int8
+    7: np.dtype("int64"),  # cf_int64
+}
+
 # %%
 def inlet_to_dict(inlet: StreamInlet) -> dict:
     """convert inlet information into a dictionary
@@ -107,3 +120,26 @@ def streaminfoxml_to_dict(xml: str) -> dict:
 
     return output
 
+
+def channel_format_to_dtype(channel_format: int) -> np.dtype:
+    """convert the channel_format of a stream into a numpy dtype
+
+    args
+    ----
+    channel_format: int
+        the format, e.g. as returned by pylsl.StreamInfo.channel_format()
+
+    returns
+    -------
+    dtype: np.dtype
+        the dtype storing values of this format without conversion. Falls back to float64 for undefined formats.
+
+
+    Example::
+
+        import liesl
+        sinfo = liesl.open_streaminfo(name="Liesl-Mock-EEG")
+        dtype = channel_format_to_dtype(sinfo.channel_format())
+
+    """
+    return channel_format_dtypes.get(channel_format, np.dtype("float64"))
@@ -0,0 +1,69 @@
+import pytest
+import asyncio
+import numpy as np
+import liesl
+from liesl.buffers.aio import AsyncRingBuffer
+from liesl.buffers.ringbuffer import RingBuffer
+from liesl.streams.finder import get_streaminfos_matching
+
+
+@pytest.fixture
+def rb(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(streaminfo=sinfo, duration_in_ms=1000)
+    rb.await_running()
+    yield rb
+    rb.stop()
+
+
+def test_asyncringbuffer_wait(rb):
+    async def main():
+        arb = AsyncRingBuffer(rb)
+        cursor = rb.cursor
+        assert await arb.wait_for_samples(100, timeout=2)
+        assert rb.cursor >= cursor + 100
+        t0 = rb.get()[1][-1, 0]
+        chunk, tstamps = await arb.get_window(t0, t0 + 0.1, timeout=2)
+        assert tstamps[-1, 0] <= t0 + 0.1
+        assert rb.get()[1][-1, 0] >= t0 + 0.1
+        assert not await arb.wait_until(np.inf, timeout=0.1)
+        arb.close()
+        assert not rb._subscribers
+
+    asyncio.run(main())
+
+
+def test_asyncringbuffer_iterate(rb):
+    async def main():
+        arb = AsyncRingBuffer(rb)
+        cursor = rb.cursor
+        count = 0
+        async for chunk, tstamps in arb:
+            assert len(chunk) == len(tstamps) > 0
+            count += len(chunk)
+            if count >= 100:
+                break
+        assert rb.cursor >= cursor + count
+
+    asyncio.run(main())
+
+
+def test_stream(mock):
+    async def main():
+        chunks = []
+        async for chunk, tstamps in liesl.stream(name="Liesl-Mock-EEG"):
+            chunks.append(chunk)
+            if len(chunks) == 10:
+                break
+        assert all(chunk.shape[1] == 8 for chunk in chunks)
+
+    asyncio.run(main())
+
+
+def test_stream_raises(mock):
+    async def main():
+        async for chunk, tstamps in liesl.stream(name="Not-Existing"):
+            pass  # pragma no cover
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(main())
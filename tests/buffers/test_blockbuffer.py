@@ -30,3 +30,40 @@ def test_simpleblockbuffer_methods():
     assert np.all((block0A - block0B) == 0)
     block = blockbuffer.get()
     assert block[0] == 50
+
+
+def test_simpleblockbuffer_chunk_equals_samples():
+    chunked = SimpleBlockBuffer(50, 4)
+    sampled = SimpleBlockBuffer(50, 4)
+    data = np.random.random((333, 4))
+    for start in range(0, 333, 37):
+        chunked.handle_chunk(data[start : start + 37])
+    for sample in data:
+        sampled.handle_sample(sample)
+    assert len(chunked.queue) == len(sampled.queue) == 6
+    for a, b in zip(chunked.queue, sampled.queue):
+        assert np.all(a == b)
+    assert chunked.buffer.head == sampled.buffer.head == 33
+    assert np.all(np.isnan(chunked.buffer.buffer[33:]))
+
+
+def test_simpleblockbuffer_hop():
+    windows = SimpleBlockBuffer(100, 2, hop=30)
+    data = np.arange(2000, dtype=float).reshape(1000, 2)
+    for start in range(0, 1000, 64):
+        windows.handle_chunk(data[start : start + 64])
+    received = []
+    block = windows.get()
+    while block is not None:
+        received.append(block)
+        block = windows.get()
+    assert len(received) == (1000 - 100) // 30 + 1
+    for idx, block in enumerate(received):
+        assert block.shape == (100, 2)
+        assert np.all(block == data[idx * 30 : idx * 30 + 100])
+        assert not block.flags.writeable
+    # consecutive windows share the overlap instead of copying it
+    assert np.shares_memory(received[0], received[1])
+    windows.handle_sample(0)
+    windows.reset()
+    assert windows.get() is None
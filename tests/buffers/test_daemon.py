@@ -0,0 +1,70 @@
+import pytest
+import socket
+import json
+from liesl.buffers.daemon import Daemon, DaemonClient
+from liesl.buffers.ringbuffer import SharedRingBuffer
+
+pytest.importorskip("multiprocessing.shared_memory")  # python >= 3.8
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix sockets")
+def test_daemon(mock, tmp_path):
+    daemon = Daemon(
+        [{"name": "Liesl-Mock-EEG"}], duration_in_ms=1000, address=tmp_path / "d.sock"
+    )
+    daemon.await_running()
+    client = DaemonClient(tmp_path / "d.sock")
+    streams = client.list()
+    assert len(streams) == 1
+    assert streams[0]["name"] == "Liesl-Mock-EEG"
+    assert streams[0]["channel_count"] == 8
+    arb = client.attach(name="Liesl-Mock-EEG")
+    daemon.buffers[0].wait_for_samples(100, timeout=5)
+    chunk, tstamps = arb.get()
+    assert chunk.shape == (len(tstamps), 8) and len(tstamps) >= 100
+    with pytest.raises(ConnectionError):
+        client.attach(name="Unknown")
+    with pytest.raises(ValueError):
+        client.request("unknown")
+    arb.close()
+    daemon.stop()
+    assert not (tmp_path / "d.sock").exists()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix sockets")
+def test_daemon_address(mock, tmp_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(tmp_path / "d.sock"))  # left over from a crashed daemon
+    daemon = Daemon([{"name": "Liesl-Mock-EEG"}], address=tmp_path / "d.sock")
+    daemon.await_running()
+    other = Daemon([{"name": "Liesl-Mock-EEG"}], address=tmp_path / "d.sock")
+    with pytest.raises(OSError, match="already listening"):
+        other.await_running()
+    other.stop()
+    assert len(DaemonClient(tmp_path / "d.sock").list()) == 1
+    daemon.stop()
+    missing = Daemon([{"name": "Liesl-Mock-EEG"}], address=tmp_path / "no" / "d.sock")
+    with pytest.raises(FileNotFoundError):
+        missing.await_running()
+    assert not any(buffer.is_alive() for buffer in missing.buffers)
+    missing.stop()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix sockets")
+def test_daemon_cleanup(mock, markermock, tmp_path):
+    created = set(SharedRingBuffer._created)
+    with pytest.raises(ValueError):  # markers have no regular sampling rate
+        Daemon([{"name": "Liesl-Mock-EEG"}, {"name": "Liesl-Mock-Marker"}])
+    assert SharedRingBuffer._created == created
+    Daemon([{"name": "Liesl-Mock-EEG"}]).stop()  # never started
+    assert SharedRingBuffer._created == created
+    daemon = Daemon([{"name": "Liesl-Mock-EEG"}], address=tmp_path / "d.sock")
+    daemon.await_running()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(tmp_path / "d.sock"))
+        with sock.makefile("rwb") as f:
+            f.write(b"[1]\n")
+            f.flush()
+            assert "error" in json.loads(f.readline())
+    assert len(DaemonClient(tmp_path / "d.sock").list()) == 1
+    daemon.stop()
@@ -0,0 +1,85 @@
+import pytest
+import time
+import numpy as np
+from liesl.buffers import filters
+from liesl.buffers.filters import SOSFilter, FilterChain
+from liesl.buffers.filters import notch, highpass, lowpass, dc_removal
+from liesl.buffers.ringbuffer import RingBuffer
+from liesl.streams.finder import get_streaminfos_matching
+
+fs = 1000
+t = np.arange(0, 2 * fs) / fs
+
+
+def sine(freq):
+    return np.sin(2 * np.pi * freq * t)[:, None]
+
+
+def test_sosfilter_raises():
+    with pytest.raises(ValueError):
+        SOSFilter([1, 0, 0, 1])
+
+
+@pytest.fixture(params=["scipy", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "scipy":
+        pytest.importorskip("scipy.signal")
+    else:
+        monkeypatch.setattr(filters, "_sosfilt", None)
+    return request.param
+
+
+def test_sosfilter_chunked_equals_continuous(backend):
+    data = np.random.random((1000, 4))
+    continuous = lowpass(30, fs).process(data)
+    chunked = lowpass(30, fs)
+    parts = [chunked.process(c) for c in np.array_split(data, 13)]
+    assert np.allclose(np.concatenate(parts), continuous)
+
+
+def test_sosfilter_difference_equation(backend):
+    x = np.random.random((100, 2))
+    b0, b1, b2, a0, a1, a2 = [0.2, 0.3, 0.1, 1.0, -0.5, 0.2]
+    y = np.zeros_like(x)
+    for n in range(len(x)):
+        y[n] = b0 * x[n]
+        if n > 0:
+            y[n] += b1 * x[n - 1] - a1 * y[n - 1]
+        if n > 1:
+            y[n] += b2 * x[n - 2] - a2 * y[n - 2]
+    assert np.allclose(SOSFilter([b0, b1, b2, a0, a1, a2]).process(x), y)
+
+
+@pytest.mark.parametrize(
+    "design, passed, blocked",
+    [
+        (lambda: notch(50, fs), 10, 50),
+        (lambda: highpass(20, fs), 100, 1),
+        (lambda: lowpass(20, fs), 1, 100),
+    ],
+)
+def test_filter_response(design, passed, blocked):
+    out = design().process(sine(passed))
+    assert np.abs(out[fs:]).max() > 0.9
+    out = design().process(sine(blocked))
+    assert np.abs(out[fs:]).max() < 0.1
+
+
+def test_dc_removal_and_chain():
+    data = sine(50) + 100
+    chain = FilterChain([dc_removal(fs, 5), notch(50, fs)])
+    out = chain.process(data)
+    assert np.abs(out[fs:]).max() < 0.1
+
+
+def test_ringbuffer_filters(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(sinfo, duration_in_ms=1000, filters=[lowpass(1, fs)])
+    assert isinstance(rb.filters, FilterChain)
+    rb.await_running()
+    time.sleep(1)
+    rb.stop()
+    chunk = rb.get_data()
+    # the first channel of the mock is uniform noise around 0.5
+    assert np.abs(chunk[-100:, 0] - 0.5).max() < 0.2
+    assert chunk.dtype == np.float32
@@ -0,0 +1,48 @@
+import pytest
+import time
+from liesl.buffers.group import BufferGroup
+from liesl.streams.finder import get_streaminfos_matching
+
+
+@pytest.fixture
+def group(mock, desclessmock):
+    sinfos = [
+        get_streaminfos_matching(name="Liesl-Mock-EEG")[0],
+        get_streaminfos_matching(name="Liesl-Descless-Mock")[0],
+    ]
+    group = BufferGroup(streaminfos=sinfos, duration_in_ms=1000)
+    group.await_running()
+    yield group
+    group.stop()
+
+
+def test_buffergroup_single_thread(group):
+    assert len(group) == 2
+    assert all(not buffer.is_alive() for buffer in group)
+    assert all(buffer.is_running for buffer in group)
+    time.sleep(0.5)
+    for chunk, tstamps in group.get():
+        assert len(chunk) > 0
+        assert len(chunk) == len(tstamps)
+
+
+def test_buffergroup_get_window(group):
+    time.sleep(0.5)
+    group.stop()
+    t1 = min(tstamps[-1, 0] for chunk, tstamps in group.get())
+    t0 = t1 - 0.2
+    for chunk, tstamps in group.get_window(t0, t1):
+        assert chunk.shape[1] == 8
+        assert tstamps[0, 0] >= t0
+        assert tstamps[-1, 0] <= t1
+        assert len(chunk) > 0
+    assert not group[0].is_running
+
+
+def test_buffergroup_dump(group, tmp_path):
+    time.sleep(0.2)
+    group.dump(tmp_path / "dumps").join()
+    assert sorted(p.name for p in (tmp_path / "dumps").iterdir()) == [
+        "0_Liesl-Mock-EEG.npz",
+        "1_Liesl-Descless-Mock.npz",
+    ]
@@ -0,0 +1,49 @@
+import pytest
+import numpy as np
+from liesl.buffers.history import CompressedHistory
+
+
+def test_compressedhistory_roundtrip():
+    history = CompressedHistory(4, "int16", duration_in_ms=10_000, blocklen=100)
+    rng = np.random.default_rng(0)
+    data = np.cumsum(rng.integers(-50, 50, (1050, 4)), axis=0).astype(np.int16)
+    data[500] = [32767, -32768, 0, 1]  # deltas which wrap around
+    tstamps = np.arange(1050) / 1000
+    for start in range(0, 1050, 70):
+        history.put(data[start : start + 70], tstamps[start : start + 70])
+    assert len(history) == 1050
+    assert history.nbytes < data[:1000].nbytes
+    chunk, stamps = history.get(0.1005, 0.8)
+    assert chunk.dtype == np.int16
+    assert np.all(chunk == data[101:801])
+    assert np.all(stamps[:, 0] == tstamps[101:801])
+    chunk, stamps = history.get(-1, 2)
+    assert np.all(chunk == data)
+
+
+def test_compressedhistory_tstamps():
+    history = CompressedHistory(8, "int16", duration_in_ms=100_000)
+    rng = np.random.default_rng(0)
+    data = np.cumsum(rng.integers(-20, 21, (10240, 8)), axis=0).astype(np.int16)
+    tstamps = 1234.5 + np.arange(10240) / 1000
+    for start in range(0, 10240, 10):  # regular within chunks, jittered between
+        tstamps[start : start + 10] += rng.uniform(-0.0002, 0.0002)
+    history.put(data, tstamps)
+    assert len(history._blocks) == 10
+    chunk, stamps = history.get(-np.inf, np.inf)
+    assert np.all(chunk == data) and np.all(stamps[:, 0] == tstamps)
+    assert history.nbytes < (data.nbytes + tstamps.nbytes) / 2
+
+
+def test_compressedhistory_duration():
+    history = CompressedHistory(1, "int32", duration_in_ms=250, blocklen=100)
+    history.put(np.arange(1000), np.arange(1000) / 1000)
+    chunk, tstamps = history.get(-1, 2)
+    assert chunk[0, 0] == 700 and chunk[-1, 0] == 999
+    history.reset()
+    assert len(history) == 0 and history.nbytes == 0
+
+
+def test_compressedhistory_requires_integers():
+    with pytest.raises(ValueError):
+        CompressedHistory(1, "float32", duration_in_ms=1000)
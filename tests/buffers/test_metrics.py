@@ -0,0 +1,42 @@
+import time
+from liesl.buffers.metrics import Histogram, BufferMetrics
+from liesl.buffers.ringbuffer import RingBuffer
+from liesl.streams.finder import get_streaminfos_matching
+
+
+def test_histogram():
+    hist = Histogram(buckets=4)
+    for value in [0, 1, 2, 3, 4, 100, -5]:
+        hist.add(value)
+    snapshot = hist.snapshot()
+    assert snapshot["count"] == 7
+    assert snapshot["max"] == 100
+    assert snapshot["mean"] == 110 / 7
+    assert snapshot["buckets"] == {"0": 2, "1": 1, "3": 2, "inf": 2}
+
+
+def test_buffermetrics_srate():
+    metrics = BufferMetrics()
+    assert metrics.effective_srate == 0.0
+    metrics.add_chunk(10, full=False)
+    time.sleep(0.1)
+    metrics.add_chunk(10, full=True)
+    assert 50 < metrics.effective_srate <= 100
+    assert metrics.full_pulls == 1
+    metrics.reset()
+    assert metrics.snapshot()["samples"] == 0
+
+
+def test_ringbuffer_metrics(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(streaminfo=sinfo, duration_in_ms=1000)
+    rb.await_running()
+    time.sleep(1)
+    rb.stop()
+    snapshot = rb.metrics.snapshot()
+    assert snapshot["samples"] == rb.cursor
+    assert snapshot["pulls"] == snapshot["chunk_size"]["count"]
+    assert snapshot["overflows"] == 0
+    assert snapshot["effective_srate"] > 100
+    for key in ["pull_us", "age_us", "lock_wait_us", "put_us"]:
+        assert snapshot[key]["count"] == snapshot["pulls"]
@@ -0,0 +1,71 @@
+import pytest
+import time
+import numpy as np
+from liesl.buffers.pyramid import DecimationPyramid
+from liesl.buffers.ringbuffer import RingBuffer
+from liesl.streams.finder import get_streaminfos_matching
+
+
+def test_pyramid_levels():
+    pyramid = DecimationPyramid(columnlen=2, levels=2, factor=10, max_bins=100)
+    data = np.repeat(np.arange(0, 1005, dtype=float)[:, None], 2, 1)
+    tstamps = np.arange(0, 1005) / 1000
+    for chunk, stamps in zip(np.array_split(data, 7), np.array_split(tstamps, 7)):
+        pyramid.put(chunk, stamps)
+    first, second = pyramid.levels
+    assert first.tstamps.shape == (100, 1)
+    assert second.tstamps.shape == (10, 1)
+    bins = first.bins.get()
+    assert np.all(bins[:, 0] == np.arange(0, 1000, 10))
+    assert np.all(bins[:, 2] == np.arange(9, 1000, 10))
+    assert np.all(bins[:, 4] == np.arange(4.5, 1000, 10))
+    bins = second.bins.get()
+    assert np.all(bins[:, 0] == np.arange(0, 1000, 100))
+    assert np.all(bins[:, 2] == np.arange(99, 1000, 100))
+
+
+def test_pyramid_nan():
+    pyramid = DecimationPyramid(columnlen=1, levels=2, factor=10, max_bins=100)
+    data = np.arange(0, 1000, dtype=float)[:, None]
+    data[15:17] = np.nan  # a dropped packet filled by the ringbuffer
+    data[20:30] = np.nan
+    pyramid.put(data, np.arange(0, 1000) / 1000)
+    first, second = pyramid.levels
+    bins = first.bins.get()
+    assert np.all(bins[1] == [10, 19, 14.25]) and np.all(np.isnan(bins[2]))
+    assert not np.any(np.isnan(second.bins.get()))
+
+
+@pytest.mark.parametrize("npoints, count", [(100, 50), (20, 5), (2, 5)])
+def test_pyramid_get(npoints, count):
+    pyramid = DecimationPyramid(columnlen=1, levels=2, factor=10, max_bins=100)
+    data = np.arange(0, 1000, dtype=float)[:, None]
+    pyramid.put(data, np.arange(0, 1000) / 1000)
+    mins, maxs, means, tstamps = pyramid.get(0.5, 0.999, npoints=npoints)
+    assert len(mins) == len(maxs) == len(means) == len(tstamps) == count
+    assert mins[0, 0] == 500
+    assert maxs[-1, 0] == 999
+
+
+def test_ringbuffer_get_decimated(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(streaminfo=sinfo, duration_in_ms=100, pyramid_levels=2)
+    with pytest.raises(ValueError):
+        RingBuffer(streaminfo=sinfo).get_decimated(0, 1)
+    rb.await_running()
+    time.sleep(1)
+    rb.stop()
+    chunk, tstamps = rb.get()
+    mins, maxs, means, bin_tstamps = rb.get_decimated(
+        tstamps[-1, 0] - 0.5, tstamps[-1, 0], npoints=100
+    )
+    assert 0 < len(mins) <= 100
+    assert mins.shape[1] == 8
+    assert np.all(mins <= means) and np.all(means <= maxs)
+    assert bin_tstamps[0, 0] < tstamps[0, 0]
+
+
+def test_ringbuffer_pyramid_bins(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(sinfo, duration_in_ms=10000, pyramid_levels=3, pyramid_bins=50)
+    assert [level.bins.max_row for level in rb.pyramid.levels] == [50, 50, 50]
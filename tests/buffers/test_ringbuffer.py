@@ -1,8 +1,11 @@
 import pytest
 import time
+import threading
 import numpy as np
 from numpy.random import random
-from liesl.buffers.ringbuffer import SimpleRingBuffer, RingBuffer
+from liesl.buffers.ringbuffer import SimpleRingBuffer, RingBuffer, load_dump
+from liesl.buffers.ringbuffer import GrowingRingBuffer, MemmapRingBuffer, SeqLock
+from liesl.buffers.ringbuffer import RingBufferReader
 from liesl.streams.finder import get_streaminfos_matching
 from sys import platform
 
@@ -91,3 +94,559 @@ def test_ringbuffer(mock):
     assert rb.max_shape == (1000, 8)
     assert rb.shape == (0, 8)
 
+
+
+def test_simpleringbuffer_wraparound():
+    ring = SimpleRingBuffer(10, 2)
+    assert ring.get().shape == (0, 2)
+    data = np.repeat(np.arange(0, 27, dtype=float)[:, None], 2, 1)
+    for chunk in np.array_split(data, 9):
+        ring.put(chunk)
+    out = ring.get()
+    assert ring.is_full
+    assert ring.shape == (10, 2)
+    assert np.all(out == data[-10:])
+
+
+def test_simpleringbuffer_views():
+    ring = SimpleRingBuffer(10, 1)
+    ring.put(np.arange(0, 5, dtype=float)[:, None])
+    ring.put(np.arange(5, 15, dtype=float)[:, None])
+    views = ring.views()
+    assert len(views) == 2
+    assert np.all(np.concatenate(views) == ring.get())
+    with pytest.raises(ValueError):
+        views[0][0] = 1
+    out = np.zeros((4, 1))
+    assert ring.copy_into(out, 6, 10) == 4
+    assert np.all(out[:, 0] == [11, 12, 13, 14])
+
+
+def test_ringbuffer_snapshot_get_into(rb):
+    time.sleep(0.5)
+    rb.stop()
+    chunk, tstamps = rb.get()
+    snap, snap_tstamps = rb.snapshot(last=100)
+    assert snap.shape == (100, 8)
+    assert snap.flags.writeable is False
+    assert np.all(snap == chunk[-100:])
+    assert np.all(snap_tstamps == tstamps[-100:])
+    data = np.empty((50, 8))
+    stamps = np.empty(50)
+    assert rb.get_into(data, stamps) == 50
+    assert np.all(data == chunk[-50:])
+    assert np.all(stamps == tstamps[-50:, 0])
+
+
+def test_simpleringbuffer_count():
+    ring = SimpleRingBuffer(10, 1)
+    ring.put(random((25, 1)))
+    assert ring.count == 25
+    ring.reset()
+    assert ring.count == 25
+    assert ring.shape == (0, 1)
+
+
+def test_ringbuffer_get_since(rb):
+    chunk, tstamps, cursor = rb.get_since(0)
+    readers = [cursor, cursor]
+    time.sleep(0.2)
+    first, first_tstamps, readers[0] = rb.get_since(readers[0])
+    time.sleep(0.2)
+    rb.stop()
+    second, second_tstamps, readers[0] = rb.get_since(readers[0])
+    both, both_tstamps, readers[1] = rb.get_since(readers[1])
+    assert readers[0] == readers[1]
+    assert len(first) + len(second) == len(both)
+    assert np.all(np.concatenate((first_tstamps, second_tstamps)) == both_tstamps)
+    assert first_tstamps[-1, 0] < second_tstamps[0, 0]
+    empty, empty_tstamps, cursor = rb.get_since(readers[0])
+    assert cursor == rb.cursor
+
+
+def test_ringbuffer_dtype(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(streaminfo=sinfo, duration_in_ms=1000)
+    assert rb.buffer.dtype == np.float32
+    assert rb.tstamps.dtype == np.float64
+    rb = RingBuffer(streaminfo=sinfo, duration_in_ms=1000, dtype="int16")
+    assert rb.get_data().dtype == np.int16
+
+
+def test_ringbuffer_pulls_strings(markermock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-Marker")[0]
+    rb = RingBuffer(streaminfo=sinfo, duration_in_ms=100000)
+    rb.await_running()
+    time.sleep(1)
+    rb.stop()
+    assert rb._destination is None
+    chunk, tstamps = rb.get()
+    assert chunk.dtype == object
+    assert len(chunk) == len(tstamps)
+    for marker in chunk[:, 0]:
+        assert marker in markermock.markernames
+
+
+def test_ringbuffer_wait_for_samples(rb):
+    cursor = rb.cursor
+    assert rb.wait_for_samples(100, timeout=2, since=cursor)
+    assert rb.cursor >= cursor + 100
+    chunk, tstamps, cursor = rb.get_since(cursor)
+    assert len(chunk) >= 100
+    assert rb.wait_until(tstamps[-1, 0] + 0.05, timeout=2)
+    assert rb.get()[1][-1, 0] >= tstamps[-1, 0] + 0.05
+    rb.stop()
+    assert rb.wait_for_samples(1, timeout=0.1) is False
+    assert rb.wait_until(np.inf, timeout=0.1) is False
+
+
+@pytest.mark.parametrize("value", [-1, 0, 4.5, 5, 9, 12, 14, 20])
+def test_simpleringbuffer_searchsorted(value):
+    ring = SimpleRingBuffer(10, 1)
+    ring.put(np.arange(0, 5, dtype=float)[:, None])
+    ring.put(np.arange(5, 15, dtype=float)[:, None])
+    column = ring.get()[:, 0]
+    for side in ["left", "right"]:
+        expected = np.searchsorted(column, value, side=side)
+        assert ring.searchsorted(value, side=side) == expected
+
+
+def test_ringbuffer_get_window(rb):
+    time.sleep(0.5)
+    rb.stop()
+    chunk, tstamps = rb.get()
+    t0, t1 = tstamps[100, 0], tstamps[200, 0]
+    window, window_tstamps = rb.get_window(t0, t1)
+    assert np.all(window == chunk[100:201])
+    assert np.all(window_tstamps == tstamps[100:201])
+    around, around_tstamps = rb.get_around(t0, pre_in_ms=20, post_in_ms=30)
+    assert around_tstamps[0, 0] >= t0 - 0.02
+    assert around_tstamps[-1, 0] <= t0 + 0.03
+    assert t0 in around_tstamps
+
+
+def test_simpleringbuffer_slack():
+    ring = SimpleRingBuffer(10, 1, slack=5)
+    ring.put(np.arange(12.0)[:, None])
+    frozen = ring.frozen()
+    assert ring.capacity == 15 and ring.shape == (10, 1) and ring.is_full
+    ring.put(np.arange(12.0, 20)[:, None])
+    assert ring.overwritten(frozen, 2) == 3 and ring.overwritten(frozen, 5) == 0
+    assert np.all(frozen.get_range(3, 10)[:, 0] == np.arange(5, 12))
+    assert np.all(ring.get()[:, 0] == np.arange(10, 20))
+
+
+def test_growingringbuffer():
+    ring = GrowingRingBuffer(2, chunklen=10)
+    assert ring.max_shape == (10, 2)
+    data = np.repeat(np.arange(0, 45, dtype=float)[:, None], 2, 1)
+    ring.put(data[:5])
+    ring.discard(3)
+    ring.put(data[5:45])
+    assert ring.shape == (42, 2)
+    assert ring.max_shape == (50, 2)
+    assert np.all(ring.get() == data[3:])
+    ring.discard(40)
+    assert ring.max_shape == (20, 2)
+    assert np.all(ring.get() == data[43:])
+
+
+def test_growingringbuffer_overwritten():
+    ring = GrowingRingBuffer(1, chunklen=10)
+    ring.put(np.arange(45.0)[:, None])
+    frozen = ring.frozen()
+    ring.discard(40)  # shrinks into a new storage
+    ring.put(np.arange(45.0, 60)[:, None])
+    assert ring.overwritten(frozen, 0) == 0
+    assert np.all(frozen.get()[:, 0] == np.arange(45))
+    frozen = ring.frozen()
+    ring.discard(5)
+    ring.put(np.arange(60.0, 65)[:, None])  # fits into the same storage
+    assert ring.overwritten(frozen, 40) == 5 and ring.overwritten(frozen, 45) == 0
+
+
+def test_ringbuffer_time_based(markermock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-Marker")[0]
+    rb = RingBuffer(streaminfo=sinfo, duration_in_ms=1500)
+    assert isinstance(rb.tstamps, GrowingRingBuffer)
+    rb.await_running()
+    time.sleep(3)
+    rb.stop()
+    chunk, tstamps = rb.get()
+    assert len(chunk) == len(tstamps)
+    if len(tstamps):
+        assert tstamps[-1, 0] - tstamps[0, 0] <= 1.5
+
+
+def test_memmapringbuffer(tmp_path):
+    ring = MemmapRingBuffer(tmp_path / "ring.dat", 10, 3, dtype="int16")
+    assert (tmp_path / "ring.dat").stat().st_size % 4096 == 0
+    data = np.arange(0, 45, dtype="int16").reshape(15, 3)
+    ring.put(data[:5])
+    ring.put(data[5:])
+    out = ring.get()
+    assert type(out) is np.ndarray
+    assert np.all(out == data[-10:])
+    assert all(isinstance(view, np.memmap) for view in ring.views())
+    ring.flush()
+    stored = np.fromfile(tmp_path / "ring.dat", dtype="int16")[:30]
+    assert np.all(np.sort(stored) == data[-10:].ravel())
+
+
+def test_ringbuffer_memmap(mock, tmp_path):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(sinfo, duration_in_ms=1000, filename=tmp_path / "eeg.dat")
+    assert isinstance(rb.buffer, MemmapRingBuffer)
+    assert (tmp_path / "eeg.dat.tstamps").exists()
+    rb.await_running()
+    time.sleep(0.5)
+    rb.stop()
+    chunk, tstamps = rb.get()
+    assert chunk.shape[0] == tstamps.shape[0] > 0
+    assert chunk.dtype == np.float32
+
+
+@pytest.mark.parametrize("worker", [False, True])
+def test_ringbuffer_subscribe(rb, worker):
+    received = []
+    threads = set()
+
+    def callback(chunk, tstamps):
+        threads.add(threading.get_ident())
+        received.append((chunk, tstamps))
+
+    def broken(chunk, tstamps):
+        raise RuntimeError("should not stop the acquisition")
+
+    rb.subscribe(broken)
+    rb.subscribe(callback, worker=worker)
+    time.sleep(0.5)
+    rb.unsubscribe(callback)
+    rb.unsubscribe(broken)
+    assert not rb._subscribers
+    rb.stop()
+    time.sleep(0.1)
+    chunk, tstamps = rb.get()
+    received_chunk = np.concatenate([c for c, t in received])
+    received_tstamps = np.concatenate([t for c, t in received])
+    start = np.searchsorted(tstamps[:, 0], received_tstamps[0, 0])
+    stop = start + len(received_tstamps)
+    assert np.all(tstamps[start:stop] == received_tstamps)
+    assert np.all(chunk[start:stop] == received_chunk)
+    assert (rb.ident in threads) is not worker
+
+
+def test_ringbuffer_channels(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    full = RingBuffer(sinfo, duration_in_ms=1000)
+    subset = RingBuffer(sinfo, duration_in_ms=1000, channels=[0, "C003"])
+    assert subset.max_shape == (1000, 2)
+    full.await_running()
+    subset.await_running()
+    time.sleep(0.5)
+    full.stop()
+    subset.stop()
+    chunk, tstamps = subset.get()
+    assert chunk.shape == (tstamps.shape[0], 2)
+    reference = full.get_data()
+    # compare the source timestamps, the clock offsets differ between inlets
+    common, idx, ref_idx = np.intersect1d(
+        subset.tstamps.get()[:, 0], full.tstamps.get()[:, 0], return_indices=True
+    )
+    assert len(common) > 0
+    assert np.all(chunk[idx] == reference[ref_idx][:, [0, 2]])
+
+
+def test_ringbuffer_channels_unknown(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    with pytest.raises(ValueError):
+        RingBuffer(sinfo, channels=["Cz"])
+    with pytest.raises(ValueError):
+        RingBuffer(sinfo, channels=[8])
+
+
+def test_ringbuffer_channels_lost(monkeypatch):
+    import pylsl
+    from liesl.buffers import ringbuffer
+
+    outlet = pylsl.StreamOutlet(pylsl.StreamInfo("Liesl-Lost", "EEG", 2, 100))
+    sinfo = get_streaminfos_matching(name="Liesl-Lost")[0]
+    del outlet
+    monkeypatch.setattr(ringbuffer, "INFO_TIMEOUT", 0.5)
+    with pytest.raises(ConnectionError):
+        RingBuffer(sinfo, channels=["C001"])
+    assert RingBuffer(sinfo, channels=[1]).max_shape == (100, 1)
+
+
+def test_ringbuffer_fill_gaps(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(sinfo, duration_in_ms=100, fill_gaps=True)
+    fs = rb.fs
+    # gaps are only detected once the jitter was observed for 0.25 s
+    rb._put(np.ones((300, 8)), np.arange(-290, 10) / fs)
+    rb._put(np.ones((5, 8)), np.arange(15, 20) / fs)
+    chunk, tstamps = rb.get()
+    chunk, tstamps = chunk[-20:], tstamps[-20:]
+    assert np.all(np.isnan(chunk[10:15]))
+    assert not np.any(np.isnan(chunk[:10])) and not np.any(np.isnan(chunk[15:]))
+    assert np.allclose(tstamps[:, 0], np.arange(20) / fs)
+    assert rb.get_gaps() == [(pytest.approx(10 / fs), 5)]
+    assert rb.index_at(12 / fs) == 12 + rb.buffer.max_row - 20
+    window, wtstamps = rb.get_window(5 / fs, 8 / fs)
+    assert np.allclose(wtstamps[:, 0], np.arange(5, 9) / fs)
+    # gaps longer than the buffer fill it with NaN
+    rb._put(np.ones((1, 8)), np.array([1000]) / fs)
+    chunk, tstamps = rb.get()
+    assert np.all(np.isnan(chunk[:-1])) and tstamps[-1, 0] == pytest.approx(1000 / fs)
+    assert np.allclose(np.diff(tstamps[:, 0]), 1 / fs)
+    assert rb.get_gaps()[-1] == (pytest.approx(20 / fs), 980)
+    with pytest.raises(ValueError):
+        RingBuffer(sinfo, dtype="int32", fill_gaps=True)
+
+
+def test_ringbuffer_fill_gaps_jitter(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(sinfo, duration_in_ms=4000, fill_gaps=True)
+    fs = rb.fs
+    rng = np.random.default_rng(0)
+    sample = np.arange(4 * int(fs)) / fs * 1.0005  # the clock of the stream drifts
+    for start in range(0, len(sample), 10):  # with jitter per chunk
+        chunk = sample[start : start + 10]
+        if start == 2000:  # 5 dropped samples
+            chunk = chunk[5:]
+        jitter = rng.uniform(-0.0002, 0.0002)
+        rb._put(np.ones((len(chunk), 8)), chunk + jitter)
+    chunk, tstamps = rb.get()
+    assert rb.get_gaps() == [(pytest.approx(sample[2000], abs=0.5 / fs), 5)]
+    assert np.isnan(chunk[:, 0]).sum() == 5
+    assert np.allclose(np.diff(tstamps[:, 0]), 1 / fs, rtol=0.05)
+    for row in (0, 10, 999, 1500, len(tstamps) - 1):
+        assert rb.index_at(tstamps[row, 0]) == row
+    t_start, t_end = tstamps[100, 0] + 0.1 / fs, tstamps[200, 0] - 0.1 / fs
+    window, wtstamps = rb.get_window(t_start, t_end)
+    assert len(window) == 99
+    assert wtstamps[0, 0] >= t_start and wtstamps[-1, 0] <= t_end
+
+
+@pytest.mark.parametrize("jitter", [0.001, 0.002])
+def test_ringbuffer_fill_gaps_large_jitter(mock, jitter):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(sinfo, duration_in_ms=5000, fill_gaps=True)
+    fs = rb.fs
+    rng = np.random.default_rng(0)
+    sample = np.arange(4 * int(fs)) / fs
+    for start in range(0, len(sample), 20):  # no samples are dropped
+        chunk = sample[start : start + 20]
+        rb._put(np.ones((len(chunk), 8)), chunk + rng.uniform(-jitter, jitter))
+    assert rb.get_gaps() == []
+    chunk, tstamps = rb.get()
+    assert len(chunk) == len(sample) and not np.any(np.isnan(chunk))
+    assert np.all(np.diff(tstamps[:, 0]) > 0)
+    assert np.abs(tstamps[:, 0] - sample).max() < jitter + 0.5 / fs
+    # a dropped packet is detected, give or take the jitter
+    rb._put(np.ones((20, 8)), sample[-20:] + 0.04 + rng.uniform(-jitter, jitter))
+    ((t_gap, count),) = rb.get_gaps()
+    assert count == pytest.approx(20, abs=jitter * fs + 0.5)
+    assert t_gap == pytest.approx(sample[-1] + 1 / fs, abs=jitter + 0.5 / fs)
+
+
+def test_ringbuffer_dump(rb, tmp_path):
+    time.sleep(0.2)
+    thread = rb.dump(tmp_path / "dump.npz")
+    thread.join()
+    chunk, tstamps, info = load_dump(tmp_path / "dump.npz")
+    assert chunk.shape == (len(tstamps), 8) and len(tstamps) > 0
+    assert np.all(np.diff(tstamps[:, 0]) > 0)
+    assert info["name"] == "Liesl-Mock-EEG"
+    assert len(info["desc"]["channels"]["channel"]) == 8
+
+
+def test_ringbuffer_dump_strings(markermock, tmp_path):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-Marker")[0]
+    rb = RingBuffer(sinfo, duration_in_ms=1000)
+    rb._put([["a"], ["b"]], [1.0, 2.0])
+    rb.dump(tmp_path / "markers").join()
+    chunk, tstamps, info = load_dump(tmp_path / "markers.npz")
+    assert chunk.tolist() == [["a"], ["b"]] and chunk.dtype == object
+    assert tstamps[:, 0].tolist() == [1.0, 2.0]
+    np.savez(tmp_path / "pickled", data=chunk, tstamps=tstamps, info="{}")
+    with pytest.raises(ValueError):
+        load_dump(tmp_path / "pickled.npz")
+
+
+def test_ringbuffer_history(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(sinfo, duration_in_ms=100, dtype="int16", history_in_ms=5000)
+    data = np.arange(3000 * 8, dtype=np.int16).reshape(3000, 8)
+    tstamps = np.arange(3000) / rb.fs
+    for start in range(0, 3000, 64):
+        rb._put(data[start : start + 64], tstamps[start : start + 64])
+    assert rb.shape == (100, 8)
+    chunk, stamps = rb.get_history(0.5, 2.95)
+    assert np.all(chunk == data[500:2951])
+    assert np.allclose(stamps[:, 0], tstamps[500:2951])
+    with pytest.raises(ValueError):
+        RingBuffer(sinfo, history_in_ms=5000)
+
+
+def test_seqlock():
+    lock = threading.Lock()
+    seqlock = SeqLock(lock, timeout=0.01)
+    calls = []
+
+    def read():
+        calls.append(seqlock.sequence)
+        if len(calls) == 1:  # the writer changes the data meanwhile
+            with seqlock.write():
+                pass
+        return len(calls)
+
+    assert seqlock.read(read) == 2
+    assert seqlock.sequence == 2
+
+    def broken():
+        raise KeyError()
+
+    with pytest.raises(KeyError):
+        seqlock.read(broken)
+    with lock, seqlock.write():  # readers fall back to the lock
+        assert seqlock.sequence % 2
+        reader = threading.Thread(target=seqlock.read, args=(read,))
+        reader.start()
+        reader.join(0.1)
+        assert reader.is_alive()
+    reader.join()
+    lockless = SeqLock(None, timeout=0.01)
+    lockless.sequence = 1  # the writer never finishes
+    with pytest.raises(TimeoutError):
+        lockless.read(read)
+
+
+class PutWhileCopying(RingBufferReader):
+    "puts n samples after the data and before the timestamps are copied"
+
+    offset = 0.0
+
+    def __init__(self, n: int):
+        self.buffer = SimpleRingBuffer(10, 1, slack=5)
+        self.tstamps = SimpleRingBuffer(10, 1, slack=5)
+        self._seqlock = SeqLock(None)  # never falls back to a lock
+        self.put(15)
+        self.n = n
+
+    def put(self, n: int):
+        with self._seqlock.write():
+            samples = np.arange(self.buffer.count, self.buffer.count + n)
+            self.buffer.put(samples[:, None])
+            self.tstamps.put(samples[:, None])
+
+    def _freeze(self):
+        buffer, tstamps = super()._freeze()
+        get_range, copy_into, n = tstamps.get_range, tstamps.copy_into, self.n
+        self.n = 0
+
+        def put_and_get_range(start, stop):
+            self.put(n)
+            return get_range(start, stop)
+
+        def put_and_copy_into(out, start, stop):
+            self.put(n)
+            return copy_into(out, start, stop)
+
+        tstamps.get_range, tstamps.copy_into = put_and_get_range, put_and_copy_into
+        return buffer, tstamps
+
+
+def test_ringbuffer_reader_keeps_rows_put_while_copying():
+    chunk, tstamps = PutWhileCopying(5).get()
+    assert np.all(chunk == tstamps) and np.all(chunk[:, 0] == np.arange(5, 15))
+    chunk, tstamps, cursor = PutWhileCopying(5).get_since(6)
+    assert cursor == 15 and np.all(chunk == tstamps) and len(chunk) == 9
+    chunk, tstamps = PutWhileCopying(5).snapshot(last=8)
+    assert np.all(chunk == tstamps) and np.all(chunk[:, 0] == np.arange(7, 15))
+    data, out = np.zeros((10, 1)), np.zeros(10)
+    assert PutWhileCopying(5).get_into(data, out) == 10
+    assert np.all(data[:, 0] == out) and np.all(out == np.arange(5, 15))
+    # only the copied rows have to be intact
+    chunk, tstamps = PutWhileCopying(9).get_window(9, 11)
+    assert np.all(chunk[:, 0] == tstamps[:, 0]) and np.all(chunk[:, 0] == [9, 10, 11])
+    # once the slack is exhausted, the copy is repeated
+    chunk, tstamps = PutWhileCopying(6).get()
+    assert np.all(chunk == tstamps) and np.all(chunk[:, 0] == np.arange(11, 21))
+    chunk, tstamps = PutWhileCopying(10).get_window(9, 11)
+    assert len(chunk) == len(tstamps) == 0
+
+
+def test_ringbuffer_reader_returns_full_windows():
+    reader = RingBufferReader()
+    reader.buffer = SimpleRingBuffer(1000, 1, slack=100)
+    reader.tstamps = SimpleRingBuffer(1000, 1, slack=100)
+    reader.offset = 0.0
+    reader._seqlock = SeqLock(threading.Lock())
+    reader.buffer.put(np.arange(1000.0)[:, None])
+    reader.tstamps.put(np.arange(1000.0)[:, None])
+    stop = threading.Event()
+
+    def write():
+        while not stop.is_set():
+            with reader._seqlock.lock, reader._seqlock.write():
+                count = reader.buffer.count
+                samples = np.arange(count, count + 25, dtype=float)[:, None]
+                reader.buffer.put(samples)
+                reader.tstamps.put(samples)
+            time.sleep(0.001)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        windows = [reader.get() for i in range(2000)]
+    finally:
+        stop.set()
+        writer.join()
+    for chunk, tstamps in windows:
+        assert len(chunk) == reader.buffer.max_row
+        assert np.all(chunk == tstamps) and np.all(np.diff(chunk[:, 0]) == 1)
+
+
+class CountingLock:
+    "a lock counting how often it was acquired"
+
+    def __init__(self, lock):
+        self.lock = lock
+        self.acquired = 0
+
+    def __enter__(self):
+        self.acquired += 1
+        return self.lock.__enter__()
+
+    def __exit__(self, *args):
+        return self.lock.__exit__(*args)
+
+
+def test_ringbuffer_readers_do_not_lock(rb):
+    rb._seqlock.lock = CountingLock(rb.bufferlock)
+    with rb.bufferlock:
+        chunk, tstamps = rb.get()
+    assert len(chunk) == len(tstamps)
+    stop = threading.Event()
+    inconsistent = []
+    reads = []
+
+    def read():
+        while not stop.is_set():
+            chunk, tstamps = rb.get()
+            reads.append(len(chunk))
+            if chunk.shape != (len(tstamps), 8) or np.any(np.diff(tstamps[:, 0]) <= 0):
+                inconsistent.append(tstamps)
+
+    readers = [threading.Thread(target=read) for i in range(4)]
+    for reader in readers:
+        reader.start()
+    time.sleep(0.5)
+    stop.set()
+    for reader in readers:
+        reader.join()
+    assert not inconsistent
+    # only while a write is in progress, and then only to read the state
+    assert rb._seqlock.lock.acquired <= len(reads) / 100
+    assert rb.metrics.lock_wait_us.max < 100_000
@@ -0,0 +1,114 @@
+import pytest
+import time
+import multiprocessing
+import numpy as np
+from liesl.buffers.ringbuffer import RingBuffer, SharedRingBuffer
+from liesl.buffers.shared import AttachedRingBuffer
+from liesl.streams.finder import get_streaminfos_matching
+
+pytest.importorskip("multiprocessing.shared_memory")  # python >= 3.8
+
+
+def test_sharedringbuffer():
+    ring = SharedRingBuffer("liesl-test-ring", 10, 2, dtype="int16", slack=3)
+    reader = SharedRingBuffer.attach("liesl-test-ring")
+    assert reader.max_shape == (10, 2) and reader.dtype == np.int16
+    assert reader.capacity == 13
+    ring.put(np.arange(30).reshape(15, 2))
+    assert reader.count == 15
+    assert np.all(reader.get() == ring.get())
+    reader.reset()  # only the creator can change the buffer
+    assert reader.shape == (10, 2)
+    ring.offset = 1.5
+    assert reader.offset == 1.5
+    sequence = reader.sequence
+    with pytest.raises(BufferError):
+        reader.close()
+    del sequence
+    reader.close()
+    ring.close()
+    with pytest.raises(FileNotFoundError):
+        SharedRingBuffer.attach("liesl-test-ring")
+
+
+def read_window(name, results):
+    arb = AttachedRingBuffer(name)
+    chunk, tstamps = arb.get()
+    results.put((chunk.shape, len(tstamps), arb.cursor))
+    arb.close()
+
+
+@pytest.fixture
+def shared(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(sinfo, duration_in_ms=1000, shared_name="liesl-test-eeg")
+    rb.await_running()
+    yield rb
+    rb.close()
+
+
+def test_attachedringbuffer(shared):
+    time.sleep(0.3)
+    arb = AttachedRingBuffer("liesl-test-eeg")
+    assert arb.offset == shared.offset
+    assert arb.max_shape == shared.max_shape
+    chunks, tstamps, first = arb.views(last=100)
+    assert sum(len(chunk) for chunk in chunks) == 100
+    assert arb.intact(first)
+    chunk, tstamps = arb.get_window(tstamps[0][0, 0] + arb.offset, np.inf)
+    assert len(chunk) >= 100
+    chunks, tstamps, first = arb.views(last=100)
+    with pytest.raises(BufferError):
+        arb.close()  # reading the views afterwards would crash
+    assert arb.intact(first)
+    part = chunks[0][10:20, :2]  # derived arrays keep the block open, too
+    del chunks, tstamps
+    with pytest.raises(BufferError):
+        arb.close()
+    del part
+    arb.close()
+
+
+def test_attachedringbuffer_timeout(shared):
+    time.sleep(0.3)
+    arb = AttachedRingBuffer("liesl-test-eeg")
+    shared.stop()
+    sequence = shared.buffer.sequence
+    sequence[0] += 1  # as if the acquisition crashed during a write
+    arb._seqlock.timeout = 0.05
+    with pytest.raises(TimeoutError):
+        arb.get()
+    sequence[0] -= 1
+    del sequence
+    assert len(arb.get()[0]) > 0
+    arb.close()
+
+
+def test_ringbuffer_close(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(sinfo, duration_in_ms=1000, shared_name="liesl-test-close")
+    rb.await_running()
+    chunks, tstamps, first = rb.views()
+    with pytest.raises(BufferError):
+        rb.close()
+    assert not rb.is_running
+    assert rb.intact(first) and len(rb.get()[0]) > 0
+    del chunks, tstamps
+    rb.close()
+    with pytest.raises(AttributeError):
+        rb.get()
+    with pytest.raises(FileNotFoundError):
+        AttachedRingBuffer("liesl-test-close")
+
+
+def test_attachedringbuffer_process(shared):
+    time.sleep(0.3)
+    results = multiprocessing.get_context("fork").Queue()
+    process = multiprocessing.get_context("fork").Process(
+        target=read_window, args=("liesl-test-eeg", results)
+    )
+    process.start()
+    shape, count, cursor = results.get(timeout=10)
+    process.join()
+    assert shape == (count, 8) and count > 0
+    assert 0 < cursor <= shared.cursor
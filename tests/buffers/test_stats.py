@@ -0,0 +1,55 @@
+import pytest
+import time
+import numpy as np
+from numpy.random import random
+from liesl.buffers.ringbuffer import SimpleRingBuffer, GrowingRingBuffer, RingBuffer
+from liesl.buffers.stats import RunningStats
+from liesl.streams.finder import get_streaminfos_matching
+
+
+def assert_matches(stats, data):
+    assert stats["count"] == len(data)
+    assert np.allclose(stats["mean"], data.mean(0))
+    assert np.allclose(stats["var"], data.var(0))
+    assert np.allclose(stats["rms"], np.sqrt((data ** 2).mean(0)))
+    assert np.all(stats["min"] == data.min(0))
+    assert np.all(stats["max"] == data.max(0))
+
+
+@pytest.mark.parametrize("chunklen", [1, 7, 50, 300])
+def test_runningstats_sliding(chunklen):
+    ring = SimpleRingBuffer(100, 3)
+    stats = RunningStats(ring, blocklen=16)
+    for i in range(20):
+        chunk = random((chunklen, 3)) * i
+        overwritten = max(0, ring.shape[0] + min(chunklen, 100) - 100)
+        evicted = ring.get_range(0, overwritten)
+        ring.put(chunk)
+        stats.add(chunk[-100:])
+        stats.remove(evicted)
+        assert_matches(stats.get(), ring.get())
+
+
+def test_runningstats_discard():
+    ring = GrowingRingBuffer(2, chunklen=10)
+    stats = RunningStats(ring, blocklen=4)
+    chunk = random((30, 2))
+    ring.put(chunk)
+    stats.add(chunk)
+    evicted = ring.get_range(0, 9)
+    ring.discard(9)
+    stats.remove(evicted)
+    assert_matches(stats.get(), ring.get())
+
+
+def test_ringbuffer_stats(mock):
+    sinfo = get_streaminfos_matching(name="Liesl-Mock-EEG")[0]
+    rb = RingBuffer(streaminfo=sinfo, duration_in_ms=200, track_stats=True)
+    with pytest.raises(ValueError):
+        RingBuffer(streaminfo=sinfo).stats()
+    rb.await_running()
+    time.sleep(0.5)
+    rb.stop()
+    data = rb.get_data().astype(np.float64)
+    assert rb.is_full
+    assert_matches(rb.stats(), data)
@@ -21,3 +21,11 @@ def test_get_channel_map(mock):
     labels = liesl.get_channel_map(stream)
     assert labels["C001"] == 0
     assert len(labels) == 8
+
+
+def test_channel_format_to_dtype(mock, markermock):
+    sinfo = liesl.open_streaminfo(name="Liesl-Mock-EEG")
+    assert liesl.channel_format_to_dtype(sinfo.channel_format()) == "float32"
+    sinfo = liesl.open_streaminfo(name="Liesl-Mock-Marker")
+    assert liesl.channel_format_to_dtype(sinfo.channel_format()) == object
+    assert liesl.channel_format_to_dtype(0) == "float64"